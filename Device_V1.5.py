@@ -1,25 +1,1758 @@
+import functools
+import hashlib
+import io
+import itertools
+import json
+from collections import OrderedDict
+import os
 import sys
+import tempfile
+import time
 import pandas as pd
 import numpy as np
 from scipy import signal
-from scipy.fft import fft, fftfreq
+from scipy.fft import rfft, rfftfreq, next_fast_len
 import pywt
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QSplitter, QLabel, QTableWidget, QTableWidgetItem,
     QHeaderView, QFileDialog, QSizePolicy, QLineEdit, QComboBox,
     QCheckBox, QGroupBox, QGridLayout, QScrollArea, QListWidget,
-    QListWidgetItem, QAbstractItemView, QColorDialog, QTabWidget
+    QListWidgetItem, QAbstractItemView, QColorDialog, QTabWidget, QStackedWidget
 )
 from PyQt6.QtGui import QFont, QColor
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
+from matplotlib.colors import to_hex
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
 
 
+# Size of the raw byte blocks handed to the CSV parser by the background loader
+CSV_BLOCK_SIZE = 8 * 1024 * 1024
+# pyarrow splits each block across its threads, so it gets larger blocks
+ARROW_CSV_BLOCK_SIZE = 64 * 1024 * 1024
+CSV_ENGINES = {'pandas (C)': 'pandas', 'pyarrow (multi-threaded)': 'pyarrow'}
+# The sidecar index stores the byte offset of every INDEX_ROW_STEP-th data row
+INDEX_ROW_STEP = 10000
+INDEX_SUFFIX = '.sigidx.json'
+INDEX_VERSION = 2
+# Bytes of lines the CSV parser treats as blank
+WHITESPACE_BYTES = np.frombuffer(b' \t\r\n', dtype=np.uint8)
+# Binary column cache written next to each loaded CSV
+CACHE_SUFFIX = '.sigcache'
+CACHE_VERSION = 5
+CACHE_HASH_BYTES = 1024 * 1024
+# A time column is replaced by (t0, dt, n) only when its deviations from the
+# ideal grid are within this fraction of dt, or within the rounding of the
+# decimals the times were written with (never more than TIMEBASE_MAX_ROUNDING
+# of dt); anything larger is real timing and the column is kept as it is
+TIMEBASE_TOLERANCE = 1e-3
+TIMEBASE_MAX_ROUNDING = 0.25
+TIMEBASE_CHECK_CHUNK = 1024 * 1024
+# Default RAM budget for lazily loaded columns before unused ones are released
+LAZY_MEMORY_BUDGET_MB = 1024
+# Columnar formats handled by read_columnar / write_columnar
+COLUMNAR_FORMATS = {
+    '.parquet': 'parquet', '.pq': 'parquet',
+    '.feather': 'feather', '.arrow': 'feather',
+    '.h5': 'hdf5', '.hdf5': 'hdf5',
+}
+HDF5_KEY = 'signals'
+SIGNAL_FILE_FILTER = ('Signal Files (*.csv *.parquet *.pq *.feather *.arrow *.h5 *.hdf5);;'
+                      'CSV Files (*.csv);;Parquet Files (*.parquet *.pq);;'
+                      'Feather/Arrow Files (*.feather *.arrow);;HDF5 Files (*.h5 *.hdf5)')
+EXPORT_FILE_FILTER = ('Parquet Files (*.parquet);;Feather/Arrow Files (*.feather);;'
+                      'HDF5 Files (*.h5)')
+# Signal lines are decimated to one min/max pair per horizontal pixel
+DECIMATION_POINTS_PER_PIXEL = 2
+DOWNSAMPLING_MODES = ['Min/Max', 'LTTB', 'None']
+# LTTB chooses its points from a min/max preselection this many times larger
+LTTB_PRESELECT = 4
+# Clicks pick samples within this many pixels horizontally; FFT picks must also
+# be this close to the line. Wider pick windows are reduced to a min/max envelope.
+PICK_RADIUS_PIXELS = 10
+PICK_MAX_CANDIDATES = 20000
+# Signal tab renderers; the fast one needs the optional pyqtgraph package
+SIGNAL_RENDERERS = ['matplotlib', 'pyqtgraph (fast)']
+# Min/max pyramid: samples per block at the finest level, block growth per
+# level, and the level count stops once a level has fewer blocks than this
+PYRAMID_BASE_BLOCK = 64
+PYRAMID_FACTOR = 4
+PYRAMID_MIN_BLOCKS = 512
+# Redraws requested for a canvas within one frame are done as a single draw, and
+# parameter edits only recompute once no edit came in for the debounce delay
+REDRAW_FRAME_MS = 16
+PARAMETER_DEBOUNCE_MS = 400
+# FFT lengths with a prime factor above this run several times slower than
+# their neighbours; Custom lengths like that are rounded up to a fast length
+FFT_MAX_PRIME_FACTOR = 127
+FFT_BENCHMARK_SIZES = [65536, 100000, 1000000, 2700000, 10000000]
+# Windows (with their correction factors) kept for reuse, least recently used
+# dropped first; longer windows are rebuilt on every call, which bounds the
+# cache to WINDOW_CACHE_SIZE * WINDOW_CACHE_MAX_SAMPLES * 8 bytes (64 MB)
+WINDOW_CACHE_SIZE = 8
+WINDOW_CACHE_MAX_SAMPLES = 1024 * 1024
+WINDOW_FUNCTIONS = {'Hanning': np.hanning, 'Hamming': np.hamming, 'Blackman': np.blackman, 'Bartlett': np.bartlett}
+# Memory kept for raw FFT spectra, so display-only changes do not recompute them
+SPECTRUM_CACHE_MB = 256
+# Spectrum methods of the FFT tab, Welch averaging is the default for long recordings
+SPECTRUM_METHODS = ['Welch PSD', 'FFT']
+# Working memory of one batch of Welch segments
+WELCH_BATCH_BYTES = 64 * 1024 * 1024
+# "Auto" segment length splits the X range into this many segments (15 averages at 50 % overlap)
+WELCH_AUTO_SEGMENTS = 8
+# Per channel memory for the segment powers kept by Median averaging; beyond it
+# only the bins up to the maximum frequency shown are kept
+WELCH_MEDIAN_MB = 128
+
+
+class ColumnBuffer:
+    """
+    Growable column array that parsed chunks are appended into in place,
+    so the full dataset is never held twice (list of chunks + concatenation)
+    """
+
+    def __init__(self, dtype, capacity):
+        self.data = np.empty(max(int(capacity), 1), dtype=dtype)
+        self.size = 0
+
+    def append(self, values):
+        values = np.asarray(values)
+        if values.dtype != self.data.dtype:
+            dtype = np.result_type(self.data.dtype, values.dtype)
+            if dtype != self.data.dtype:
+                self.data = self.data.astype(dtype)
+        needed = self.size + len(values)
+        if needed > len(self.data):
+            grown = np.empty(max(needed, int(len(self.data) * 1.5)), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:needed] = values
+        self.size = needed
+
+    def values(self):
+        """View of the filled part of the buffer (no copy)"""
+        return self.data[:self.size]
+
+
+class MatrixBuffer:
+    """
+    Growable (channels x samples) block that parsed chunks are appended into.
+    Compacted in place at the end so the result is one C-contiguous array.
+    """
+
+    def __init__(self, n_channels, dtype, capacity):
+        self.data = np.empty((n_channels, max(int(capacity), 1)), dtype=dtype)
+        self.size = 0
+
+    def append(self, channels):
+        """:param channels: one 1D array per channel, all the same length"""
+        needed = self.size + len(channels[0])
+        if needed > self.data.shape[1]:
+            grown = np.empty((self.data.shape[0], max(needed, int(self.data.shape[1] * 1.5))),
+                             dtype=self.data.dtype)
+            grown[:, :self.size] = self.data[:, :self.size]
+            self.data = grown
+        for row, values in enumerate(channels):
+            self.data[row, self.size:needed] = values
+        self.size = needed
+
+    def values(self):
+        """C-contiguous (channels x size) view, made by moving rows down in place"""
+        n_channels, capacity = self.data.shape
+        if capacity == self.size:
+            return self.data
+        flat = self.data.reshape(-1)
+        for row in range(1, n_channels):
+            flat[row * self.size:(row + 1) * self.size] = flat[row * capacity:row * capacity + self.size]
+        return flat[:n_channels * self.size].reshape(n_channels, self.size)
+
+
+class CsvIndexBuilder:
+    """
+    Collect the sidecar index of a CSV file while it is being parsed:
+    row count, per-column min/max/mean, detected sample rate and the byte
+    offset of every `step`-th data row
+    """
+
+    def __init__(self, file_path, columns, header_bytes, step=INDEX_ROW_STEP):
+        self.file_path = file_path
+        self.columns = columns
+        self.header_bytes = header_bytes
+        self.step = step
+        self.offsets = []
+        self.n_rows = 0
+        self.mins = {}
+        self.maxs = {}
+        self.sums = {}
+        self.counts = {}
+        self.sample_rate = None
+        self.time_column = None
+
+    def add_block(self, data, data_offset, chunk):
+        """
+        :param data: raw bytes of the block (complete lines only)
+        :param data_offset: file offset of the first byte of the block
+        :param chunk: DataFrame parsed from the block
+        """
+        raw = np.frombuffer(data, dtype=np.uint8)
+        starts = np.concatenate(([0], np.flatnonzero(raw == ord('\n')) + 1))
+        if starts[-1] == len(data):
+            starts = starts[:-1]
+        # Blank (whitespace only) lines are skipped by the parser, skip them here too
+        content = np.concatenate(([0], np.cumsum(~np.isin(raw, WHITESPACE_BYTES))))
+        starts = starts[np.diff(content[np.append(starts, len(data))]) > 0]
+        if self.offsets is not None and len(starts) == len(chunk):
+            rows = np.arange(self.n_rows, self.n_rows + len(starts))
+            self.offsets.extend((data_offset + starts[rows % self.step == 0]).tolist())
+        else:
+            self.offsets = None
+
+        if self.n_rows == 0 and len(chunk) > 2:
+            self.detect_sample_rate(chunk)
+
+        for column in self.columns:
+            values = chunk[column].to_numpy()
+            if not np.issubdtype(values.dtype, np.number):
+                continue
+            valid = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+            if len(valid) == 0:
+                continue
+            self.mins[column] = min(self.mins.get(column, np.inf), float(valid.min()))
+            self.maxs[column] = max(self.maxs.get(column, -np.inf), float(valid.max()))
+            self.sums[column] = self.sums.get(column, 0.0) + float(valid.sum(dtype=np.float64))
+            self.counts[column] = self.counts.get(column, 0) + len(valid)
+        self.n_rows += len(chunk)
+
+    def detect_sample_rate(self, chunk):
+        """Take the sample rate from the first column if it is an increasing time axis"""
+        column = self.columns[0]
+        values = chunk[column].to_numpy()
+        if not np.issubdtype(values.dtype, np.number):
+            return
+        steps = np.diff(values.astype(np.float64))
+        if len(steps) and np.all(steps > 0):
+            self.time_column = column
+            self.sample_rate = 1.0 / float(np.median(steps))
+
+    def finish(self):
+        stat = os.stat(self.file_path)
+        return {
+            'version': INDEX_VERSION,
+            'file_size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'rows': self.n_rows,
+            'columns': self.columns,
+            'header_bytes': self.header_bytes,
+            'stats': {column: {'min': self.mins[column],
+                               'max': self.maxs[column],
+                               'mean': self.sums[column] / self.counts[column]}
+                      for column in self.counts},
+            'time_column': self.time_column,
+            'sample_rate': self.sample_rate,
+            'offset_step': self.step,
+            'offsets': self.offsets,
+        }
+
+
+def load_index(file_path):
+    """
+    Read the sidecar index of a CSV file
+    :return: index dict, or None if it is missing or out of date
+    """
+    try:
+        with open(file_path + INDEX_SUFFIX) as fh:
+            index = json.load(fh)
+        stat = os.stat(file_path)
+    except (OSError, ValueError):
+        return None
+    if (index.get('version') != INDEX_VERSION or index.get('file_size') != stat.st_size
+            or index.get('mtime') != stat.st_mtime):
+        return None
+    return index
+
+
+def save_index(file_path, index):
+    try:
+        with open(file_path + INDEX_SUFFIX, 'w') as fh:
+            json.dump(index, fh)
+    except OSError as e:
+        print(f"Could not write index for {file_path}: {e}")
+
+
+class UniformTimebase:
+    """
+    Uniformly sampled axis stored as (t0, dt, n) instead of a float64 array.
+    Values are generated on demand and range lookups are index arithmetic.
+    """
+
+    def __init__(self, t0, dt, n):
+        self.t0 = float(t0)
+        self.dt = float(dt)
+        self.n = int(n)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def sample_rate(self):
+        return 1.0 / self.dt
+
+    def values(self, start=0, stop=None):
+        """Materialise samples [start, stop)"""
+        stop = self.n if stop is None else min(stop, self.n)
+        return self.t0 + self.dt * np.arange(start, stop, dtype=np.float64)
+
+    def take(self, indices):
+        """Samples at the given integer indices"""
+        return self.t0 + self.dt * np.asarray(indices, dtype=np.float64)
+
+    def slice_between(self, x_min=None, x_max=None):
+        """:return: slice of the samples with x_min <= t <= x_max, in O(1)"""
+        start = 0 if x_min is None else int(np.ceil((x_min - self.t0) / self.dt - 1e-9))
+        stop = self.n if x_max is None else int(np.floor((x_max - self.t0) / self.dt + 1e-9)) + 1
+        start = min(max(start, 0), self.n)
+        return slice(start, max(min(stop, self.n), start))
+
+
+def on_decimal_grid(values, step):
+    """
+    Whether every value is a multiple of the decimal `step` (up to float error)
+    """
+    scaled = np.asarray(values, dtype=np.float64) / step
+    return bool(np.all(np.abs(scaled - np.round(scaled)) <= 1e-6))
+
+
+def decimal_resolution(values, sample_size=1000):
+    """
+    Decimal step the values were written with (e.g. 1e-6 for '%.6f'), judged
+    from the first `sample_size` of them; 0.0 for full-precision floats
+    """
+    sample = values[:sample_size]
+    for digits in range(13):
+        if on_decimal_grid(sample, 10.0 ** -digits):
+            return 10.0 ** -digits
+    return 0.0
+
+
+def detect_uniform_timebase(values, tolerance=TIMEBASE_TOLERANCE):
+    """
+    Check whether an axis column is uniformly sampled: strictly increasing, no
+    gaps and no deviation from the grid beyond `tolerance` * dt or what
+    rounding to the written decimals explains. The check runs in chunks so it
+    never allocates more than TIMEBASE_CHECK_CHUNK temporaries.
+    :return: UniformTimebase, or None if the column is not uniform
+    """
+    n = len(values)
+    if n < 2 or not np.issubdtype(values.dtype, np.number):
+        return None
+    t0 = float(values[0])
+    dt = (float(values[-1]) - t0) / (n - 1)
+    if not np.isfinite(dt) or dt <= 0:
+        return None
+    # Rounding to the written decimals moves a value by up to half a decimal
+    # step and the endpoint-based dt by up to a whole one over the record
+    resolution = decimal_resolution(values)
+    rounding = min(1.5 * resolution, TIMEBASE_MAX_ROUNDING * dt)
+    if np.issubdtype(values.dtype, np.floating):
+        # A few ULPs of the column's own precision are representation, not timing
+        ulps = 4 * np.finfo(values.dtype).eps * max(abs(t0), abs(float(values[-1])))
+        tolerance = max(tolerance, ulps / dt)
+    for start in range(0, n, TIMEBASE_CHECK_CHUNK):
+        stop = min(start + TIMEBASE_CHECK_CHUNK, n)
+        chunk = values[start:stop].astype(np.float64)
+        grid = t0 + dt * np.arange(start, stop, dtype=np.float64)
+        steps = np.diff(values[max(start - 1, 0):stop].astype(np.float64))
+        deviation = max(np.abs(chunk - grid).max(), np.abs(steps - dt).max() if len(steps) else 0.0)
+        if deviation <= tolerance * dt:
+            continue
+        # Larger deviations pass only if they are rounding: the values must all
+        # sit on the decimal grid and stay within its error
+        if deviation > rounding or not resolution or not on_decimal_grid(chunk, resolution):
+            return None
+    return UniformTimebase(t0, dt, n)
+
+
+def is_sorted(values):
+    """Check that an array is non-decreasing, in chunks to bound temporaries"""
+    for start in range(0, len(values), TIMEBASE_CHECK_CHUNK):
+        chunk = values[max(start - 1, 0):start + TIMEBASE_CHECK_CHUNK]
+        if np.any(chunk[1:] < chunk[:-1]):
+            return False
+    return True
+
+
+def minmax_decimate(values, n_bins):
+    """
+    Indices of the minimum and maximum sample in each of `n_bins` equal bins,
+    in sample order, so spikes survive when a line is drawn at screen resolution
+    :return: sorted index array (every index when the data already fits)
+    """
+    n = len(values)
+    if n <= 2 * n_bins:
+        return np.arange(n)
+    bin_size = -(-n // n_bins)
+    n_full = n // bin_size
+    body = values[:n_full * bin_size].reshape(n_full, bin_size)
+    offsets = np.arange(n_full) * bin_size
+    # The end samples are kept so the line still spans the whole range
+    picks = [[0, n - 1], body.argmin(axis=1) + offsets, body.argmax(axis=1) + offsets]
+    if n_full * bin_size < n:
+        tail = values[n_full * bin_size:]
+        picks.append(np.array([tail.argmin(), tail.argmax()]) + n_full * bin_size)
+    return np.unique(np.concatenate(picks))
+
+
+def maxpool_columns(values, n_bins):
+    """
+    Reduce a (rows x samples) array to at most `n_bins` columns, each the
+    maximum of a run of consecutive samples, so short bursts stay visible
+    """
+    n = values.shape[1]
+    if n <= n_bins:
+        return values
+    edges = np.linspace(0, n, n_bins + 1).astype(np.int64)[:-1]
+    return np.maximum.reduceat(values, edges, axis=1)
+
+
+def make_window(window_type, n, beta=None, dtype=np.dtype(np.float64)):
+    """
+    Window of `n` samples with its coherent gain and equivalent noise bandwidth
+    (in bins). The array may be shared between callers, so it is read-only.
+    :return: (window, coherent_gain, enbw), window is None for Rectangular
+    """
+    if window_type == "Kaiser":
+        window = np.kaiser(n, beta)
+    elif window_type in WINDOW_FUNCTIONS:
+        window = WINDOW_FUNCTIONS[window_type](n)
+    else:  # Rectangular, nothing to multiply by
+        return None, 1.0, 1.0
+    total = window.sum()
+    coherent_gain = total / n if total else 1.0
+    enbw = n * np.sum(window ** 2) / total ** 2 if total else 1.0
+    window = window.astype(dtype)
+    window.flags.writeable = False
+    return window, coherent_gain, enbw
+
+
+_cached_window = functools.lru_cache(maxsize=WINDOW_CACHE_SIZE)(make_window)
+
+
+def cached_window(window_type, n, beta=None, dtype=np.dtype(np.float64)):
+    """
+    make_window, cached by (type, length, Kaiser beta, dtype) up to
+    WINDOW_CACHE_MAX_SAMPLES samples
+    :return: (window, coherent_gain, enbw), window is None for Rectangular
+    """
+    if n > WINDOW_CACHE_MAX_SAMPLES:
+        return make_window(window_type, n, beta, dtype)
+    return _cached_window(window_type, n, beta, dtype)
+
+
+def real_spectrum(block, window, n_fft, sample_rate):
+    """
+    One-sided magnitude spectrum of every channel of a (channels x samples)
+    block, with a single real FFT along the sample axis on all cores
+    :param window: window to multiply by, or None for Rectangular
+    :return: (frequencies, magnitudes) with magnitudes shaped (channels x bins)
+    """
+    if window is not None:
+        block = block * window
+    spectrum = rfft(block, n=n_fft, axis=-1, workers=-1)
+    return rfftfreq(n_fft, 1 / sample_rate), np.abs(spectrum)
+
+
+def largest_prime_factor(n):
+    """Largest prime factor of a positive integer (1 for n <= 1)"""
+    if n <= 1:
+        return 1
+    largest = 1
+    for factor in (2, 3, 5):
+        while n % factor == 0:
+            largest = factor
+            n //= factor
+    factor = 7
+    while factor * factor <= n:
+        while n % factor == 0:
+            largest = factor
+            n //= factor
+        factor += 2
+    return max(largest, n) if n > 1 else largest
+
+
+def median_bias(n):
+    """Ratio of the median to the mean of `n` chi-squared (2 dof) periodogram values, as in scipy.signal.welch"""
+    ii_2 = 2 * np.arange(1., (n - 1) // 2 + 1)
+    return 1 + np.sum(1. / (ii_2 + 1) - 1. / ii_2)
+
+
+def welch_psd(read_block, n, n_channels, nperseg, window, step, sample_rate, average='Mean', n_bins=None):
+    """
+    One-sided Welch PSD of every channel, reading the signal in batches of
+    segments so memory stays bounded whatever the recording length.
+    Segments are mean-detrended and windowed like scipy.signal.welch.
+    :param read_block: callable(start, stop) returning the (channels x samples) block of those samples
+    :param n: number of samples
+    :param n_channels: number of channels returned by read_block
+    :param nperseg: segment length
+    :param window: read-only window of `nperseg` samples, or None for Rectangular
+    :param step: samples between segment starts (segment length - overlap)
+    :param average: 'Mean', or 'Median' (the powers of every segment are kept to take it, in float32)
+    :param n_bins: number of lowest frequency bins to return (None = all)
+    :return: (frequencies, psd) with psd shaped (channels x bins)
+    """
+    n_segments = 1 + (n - nperseg) // step
+    n_bins = nperseg // 2 + 1 if n_bins is None else min(n_bins, nperseg // 2 + 1)
+    window_power = nperseg if window is None else np.sum(window.astype(np.float64) ** 2)
+    scale = 1.0 / (sample_rate * window_power)
+    # Segment copies, their spectra and powers take about 4 float64 values per sample
+    batch_segments = max(1, WELCH_BATCH_BYTES // (4 * 8 * n_channels * nperseg))
+    total = None
+    powers = np.empty((n_channels, n_segments, n_bins), dtype=np.float32) if average == 'Median' else None
+    first = 0
+    while first < n_segments:
+        count = min(batch_segments, n_segments - first)
+        block = read_block(first * step, (first + count - 1) * step + nperseg)
+        segments = np.lib.stride_tricks.sliding_window_view(block, nperseg, axis=-1)[:, ::step]
+        segments = segments - segments.mean(axis=-1, keepdims=True)
+        if window is not None:
+            segments *= window
+        power = np.abs(rfft(segments, axis=-1, workers=-1)[..., :n_bins]) ** 2
+        if average == 'Median':
+            powers[:, first:first + count] = power
+        elif total is None:
+            total = power.sum(axis=1, dtype=np.float64)
+        else:
+            total += power.sum(axis=1)
+        first += count
+    if average == 'Median':
+        psd = np.median(powers, axis=1).astype(np.float64) / median_bias(n_segments)
+    else:
+        psd = total / n_segments
+    psd *= scale
+    # Fold the negative frequencies into the one-sided spectrum (not DC or Nyquist)
+    has_nyquist = nperseg % 2 == 0 and n_bins == nperseg // 2 + 1
+    psd[:, 1:-1 if has_nyquist else None] *= 2
+    return rfftfreq(nperseg, 1 / sample_rate)[:n_bins], psd
+
+
+class SpectrumCache:
+    """
+    Raw FFT results by key, dropping the least recently used ones once their
+    arrays take more than `max_bytes`. An array shared by several entries (the
+    frequency axis of channels transformed together) is counted once.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        # id(array) -> [array, number of entries holding it]
+        self.arrays = {}
+        self.nbytes = 0
+
+    def hold(self, entry):
+        for value in entry:
+            if isinstance(value, np.ndarray):
+                held = self.arrays.setdefault(id(value), [value, 0])
+                if held[1] == 0:
+                    self.nbytes += value.nbytes
+                held[1] += 1
+
+    def release(self, entry):
+        for value in entry:
+            if isinstance(value, np.ndarray):
+                held = self.arrays[id(value)]
+                held[1] -= 1
+                if held[1] == 0:
+                    self.nbytes -= value.nbytes
+                    del self.arrays[id(value)]
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        if key in self.entries:
+            self.release(self.entries.pop(key))
+        self.entries[key] = entry
+        self.hold(entry)
+        # The newest entry is kept even if it is larger than the budget on its own
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            self.release(self.entries.popitem(last=False)[1])
+
+    def clear(self):
+        self.entries.clear()
+        self.arrays.clear()
+        self.nbytes = 0
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indices of `n_out` points that keep the
+    visual shape of a smooth line. The end points are always kept, every bucket
+    in between keeps the point forming the largest triangle with the point kept
+    before it and the average of the next bucket.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    n_buckets = n_out - 2
+    edges = (np.arange(n_buckets + 1) * ((n - 2) / n_buckets)).astype(np.int64) + 1
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts, x[-1]).tolist()
+    avg_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts, y[-1]).tolist()
+    xs, ys, edges = np.asarray(x, dtype=np.float64).tolist(), np.asarray(y, dtype=np.float64).tolist(), edges.tolist()
+    picks = [0]
+    ax, ay = xs[0], ys[0]
+    for i in range(n_buckets):
+        # Twice the triangle area, linear in the candidate point
+        alpha, beta = ax - avg_x[i + 1], avg_y[i + 1] - ay
+        best, best_area = edges[i], -1.0
+        for j in range(edges[i], edges[i + 1]):
+            area = abs(alpha * (ys[j] - ay) + beta * (xs[j] - ax))
+            if area > best_area:
+                best, best_area = j, area
+        picks.append(best)
+        ax, ay = xs[best], ys[best]
+    picks.append(n - 1)
+    return np.array(picks)
+
+
+def downsample_indices(x, y, n_points, mode='Min/Max'):
+    """
+    Indices of the points kept when a line is drawn with about `n_points` points
+    :param mode: one of DOWNSAMPLING_MODES
+    """
+    if mode == 'None' or len(y) <= n_points:
+        return np.arange(len(y))
+    if mode == 'LTTB':
+        picks = minmax_decimate(y, n_points * LTTB_PRESELECT // 2)
+        return picks[lttb_indices(x[picks], y[picks], n_points)]
+    return minmax_decimate(y, max(n_points // 2, 1))
+
+
+class LinePickIndex:
+    """
+    Nearest-sample picking for one plotted line. The samples around a click
+    are found by binary search on the sorted X values (index arithmetic on a
+    UniformTimebase), and the closest one is chosen by its distance in display
+    pixels, so picking is O(log n) and works the same on logarithmic axes.
+    Lines with unsorted X are sorted once when the index is built.
+    """
+
+    def __init__(self, x, y, rows=None):
+        self.x = x
+        self.y = y
+        self.order = None
+        self.start, self.stop = 0, len(y)
+        if isinstance(rows, slice):
+            self.start, self.stop = rows.start, rows.stop
+        elif rows is not None:
+            positions = np.flatnonzero(rows)
+            self.order = positions[np.argsort(x[positions], kind='stable')]
+            self.x = x[self.order]
+            self.stop = len(self.order)
+
+    def window(self, x_lo, x_hi):
+        """(lo, hi) positions of the samples between x_lo and x_hi, widened by one sample on each side"""
+        if isinstance(self.x, UniformTimebase):
+            found = self.x.slice_between(x_lo, x_hi)
+            lo, hi = found.start, found.stop
+        else:
+            x_values = self.x[self.start:self.stop]
+            lo = self.start + int(np.searchsorted(x_values, x_lo, side='left'))
+            hi = self.start + int(np.searchsorted(x_values, x_hi, side='right'))
+        lo = min(max(lo - 1, self.start), self.stop - 1)
+        return lo, max(min(hi + 1, self.stop), lo + 1)
+
+    def nearest(self, x_lo, x_hi, to_display, click):
+        """
+        :param x_lo, x_hi: X range of the pick radius around the click
+        :param to_display: maps data (x, y) arrays to display pixel (x, y) arrays
+        :param click: (x, y) of the click in display pixels
+        :return: (distance in pixels, x, y) of the closest sample, or None
+        """
+        if self.stop <= self.start:
+            return None
+        lo, hi = self.window(x_lo, x_hi)
+        candidates = np.arange(lo, hi)
+        rows = candidates if self.order is None else self.order[candidates]
+        if len(candidates) > PICK_MAX_CANDIDATES:
+            keep = minmax_decimate(self.y[rows], PICK_MAX_CANDIDATES // 2)
+            candidates, rows = candidates[keep], rows[keep]
+        x_values = self.x.take(candidates) if isinstance(self.x, UniformTimebase) else self.x[candidates]
+        y_values = self.y[rows]
+        display_x, display_y = to_display(x_values, y_values)
+        distances = np.hypot(display_x - click[0], display_y - click[1])
+        if not np.isfinite(distances).any():
+            return None
+        best = int(np.nanargmin(distances))
+        return distances[best], x_values[best], y_values[best]
+
+
+class MinMaxPyramid:
+    """
+    Multi-resolution min/max of a channel. Level k stores, for every block of
+    block_sizes[k] samples, the indices of its minimum and maximum sample as a
+    (2, n_blocks) array. Each level is built from the one below it, so the
+    whole pyramid costs one pass over the data and about 1/20 of its memory.
+    """
+
+    def __init__(self, block_sizes, levels):
+        self.block_sizes = list(block_sizes)
+        self.levels = list(levels)
+
+    @classmethod
+    def build(cls, values, base=PYRAMID_BASE_BLOCK, factor=PYRAMID_FACTOR, min_blocks=PYRAMID_MIN_BLOCKS):
+        n_blocks = len(values) // base
+        if n_blocks < min_blocks:
+            return cls([], [])
+        body = values[:n_blocks * base].reshape(n_blocks, base)
+        offsets = np.arange(n_blocks, dtype=np.int64) * base
+        level = np.stack([body.argmin(axis=1) + offsets, body.argmax(axis=1) + offsets])
+        block_sizes, levels = [base], [level]
+        while level.shape[1] // factor >= min_blocks:
+            level = cls.reduce(values, level, factor)
+            block_sizes.append(block_sizes[-1] * factor)
+            levels.append(level)
+        return cls(block_sizes, levels)
+
+    @staticmethod
+    def reduce(values, level, group):
+        """Merge every `group` consecutive blocks of a level, dropping the remainder"""
+        n_groups = level.shape[1] // group
+        mins = level[0, :n_groups * group].reshape(n_groups, group)
+        maxs = level[1, :n_groups * group].reshape(n_groups, group)
+        rows = np.arange(n_groups)
+        return np.stack([mins[rows, values[mins].argmin(axis=1)],
+                         maxs[rows, values[maxs].argmax(axis=1)]])
+
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels if not isinstance(level, np.memmap))
+
+    def decimate(self, values, start, stop, n_bins):
+        """
+        Min/max envelope indices of values[start:stop] with about `n_bins`
+        bins, read from the coarsest level whose blocks still fit in a bin.
+        Only the partial blocks at both ends touch the samples themselves.
+        :return: sorted absolute index array, or None when no level fits
+        """
+        bin_size = (stop - start) / max(n_bins, 1)
+        fitting = [k for k, size in enumerate(self.block_sizes) if size <= bin_size]
+        if not fitting:
+            return None
+        size, level = self.block_sizes[fitting[-1]], self.levels[fitting[-1]]
+        first = -(-start // size)
+        last = min(stop // size, level.shape[1])
+        if last - first < n_bins:
+            return None
+        picks = level[:, first:last]
+        group = -(-(last - first) // n_bins)
+        if group > 1:
+            n_groups = (last - first) // group
+            picks = np.concatenate([self.reduce(values, picks, group), picks[:, n_groups * group:]], axis=1)
+        edges = [np.array([start, stop - 1], dtype=np.int64), picks.ravel()]
+        for edge_start, edge_stop in ((start, first * size), (last * size, stop)):
+            if edge_stop > edge_start:
+                edge = values[edge_start:edge_stop]
+                edges.append(np.array([edge.argmin(), edge.argmax()]) + edge_start)
+        return np.unique(np.concatenate(edges))
+
+
+class ChannelMatrix:
+    """
+    Channels stored as one C-contiguous (channels x samples) block with a
+    name -> row index, so processing can run as one call along axis=-1
+    """
+
+    def __init__(self, names, data):
+        self.names = list(names)
+        self.data = data
+        self.index = {name: row for row, name in enumerate(self.names)}
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __getitem__(self, name):
+        return self.data[self.index[name]]
+
+    def block(self, names):
+        """
+        Rows of the given channels: a view when they are consecutive rows in
+        order, otherwise a gathered copy
+        """
+        rows = [self.index[name] for name in names]
+        if rows == list(range(rows[0], rows[0] + len(rows))):
+            return self.data[rows[0]:rows[0] + len(rows)]
+        return self.data[rows]
+
+
+class SignalDataset:
+    """
+    Column store used by the analyzer in place of a DataFrame.
+    Columns are plain NumPy arrays. Columns that are not loaded yet are read on
+    first access through `loader` (a callable taking a list of column names and
+    returning a dict of arrays) and can be released again to free memory.
+    A uniformly sampled time column (by default the first one) is kept as a
+    UniformTimebase instead of an array.
+    A dataset made with derive() is a processing layer: it only stores the
+    columns it overrides and reads every other column from its parent.
+    Channels loaded or processed together are kept in a ChannelMatrix so they
+    can be fetched as one 2D block with matrix().
+    """
+    _versions = itertools.count()
+
+    def __init__(self, columns, n_rows=None, arrays=None, loader=None, preview=None, time_column=None,
+                 parent=None):
+        self.columns = list(columns)
+        self.n_rows = n_rows
+        self.parent = parent
+        self.arrays = {}
+        self.timebases = {}
+        self.matrix_of = {}
+        self.pyramids = {}
+        self.loader = loader
+        self.preview = preview
+        self.time_column = time_column if time_column is not None else (self.columns[0] if self.columns else None)
+        self.last_used = {}
+        self.sorted_columns = {}
+        self._clock = itertools.count()
+        # Changes whenever stored values change, results computed from the data are cached by it
+        self.version = next(SignalDataset._versions)
+        self.store(arrays or {})
+
+    def __len__(self):
+        if self.n_rows is None and self.parent is not None:
+            return len(self.parent)
+        return self.n_rows or 0
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        if not self.owns(name):
+            if self.parent is not None and name in self.parent:
+                return self.parent[name]
+            if name not in self.columns:
+                raise KeyError(name)
+            self.load([name])
+        if name in self.timebases:
+            return self.timebases[name].values()
+        self.last_used[name] = next(self._clock)
+        return self.arrays[name]
+
+    def store(self, arrays):
+        """
+        Add loaded columns. Values may be arrays, a UniformTimebase, or the
+        ChannelMatrix holding that column. A uniform time column becomes a timebase.
+        """
+        for name, values in arrays.items():
+            if name not in self.columns:
+                self.columns.append(name)
+            self.sorted_columns.pop(name, None)
+            self.matrix_of.pop(name, None)
+            self.timebases.pop(name, None)
+            self.arrays.pop(name, None)
+            if isinstance(values, ChannelMatrix):
+                self.matrix_of[name] = values
+                values = values[name]
+            if self.n_rows is None:
+                self.n_rows = len(values)
+            if name == self.time_column and not isinstance(values, UniformTimebase):
+                values = detect_uniform_timebase(values) or values
+            if isinstance(values, UniformTimebase):
+                self.timebases[name] = values
+            else:
+                self.arrays[name] = values
+                self.last_used[name] = next(self._clock)
+
+    def assign(self, names, block):
+        """Store a processed (channels x samples) block as the given columns"""
+        matrix = ChannelMatrix(names, np.ascontiguousarray(block))
+        self.version = next(SignalDataset._versions)
+        self.store({name: matrix for name in names})
+        for name in names:
+            self.pyramids[name] = MinMaxPyramid.build(matrix[name])
+
+    def pyramid(self, name):
+        """Min/max pyramid of a column, built on first use if it was not built at load time"""
+        if not self.owns(name) and self.parent is not None and name in self.parent:
+            return self.parent.pyramid(name)
+        if name not in self.pyramids:
+            self.pyramids[name] = MinMaxPyramid.build(self[name])
+        return self.pyramids[name]
+
+    def build_pyramids(self, names=None):
+        """Build the min/max pyramids of all (or the given) numeric channels"""
+        for name in (self.columns if names is None else names):
+            if name != self.time_column and np.issubdtype(self[name].dtype, np.number):
+                self.pyramid(name)
+
+    def matrix(self, names, rows=None):
+        """
+        Channels as one (channels x samples) array, restricted to `rows`.
+        Zero-copy when the channels are consecutive rows of one stored
+        ChannelMatrix and `rows` is a slice; otherwise they are gathered.
+        """
+        if not any(self.owns(name) for name in names) and self.parent is not None:
+            return self.parent.matrix(names, rows)
+        matrices = {id(self.matrix_of.get(name)) for name in names}
+        if len(matrices) == 1 and names[0] in self.matrix_of:
+            block = self.matrix_of[names[0]].block(names)
+            return block if rows is None else block[:, rows]
+        if rows is None:
+            rows = slice(None)
+        return np.stack([self.column_rows(name, rows) for name in names])
+
+    def owns(self, name):
+        """The column is stored in this layer (not inherited from the parent)"""
+        return name in self.arrays or name in self.timebases
+
+    def is_loaded(self, name):
+        if self.owns(name):
+            return True
+        return self.parent is not None and self.parent.is_loaded(name)
+
+    def load(self, names):
+        """Make sure the given columns are in memory"""
+        missing = [name for name in names if not self.is_loaded(name)]
+        if not missing:
+            return
+        if self.parent is not None:
+            self.parent.load([name for name in missing if name in self.parent])
+            missing = [name for name in missing if name not in self.parent]
+            if not missing:
+                return
+        if self.loader is None:
+            raise KeyError(missing[0])
+        self.store(self.loader(missing))
+
+    def derive(self):
+        """New processing layer on top of this dataset, initially storing nothing"""
+        return SignalDataset(self.columns, self.n_rows, preview=self.preview,
+                             time_column=self.time_column, parent=self)
+
+    def timebase(self, name):
+        """:return: the UniformTimebase of a column, or None if it is a plain array"""
+        if name in self.timebases:
+            return self.timebases[name]
+        if name in self.arrays:
+            return None
+        if self.parent is not None and name in self.parent:
+            return self.parent.timebase(name)
+        if name in self.columns:
+            self.load([name])
+        return self.timebases.get(name)
+
+    def sample_rate(self, name):
+        """Sample rate of an axis column, None if it cannot be derived"""
+        timebase = self.timebase(name)
+        if timebase is not None:
+            return timebase.sample_rate
+        values = self[name]
+        if len(values) > 1 and values[1] != values[0]:
+            return 1.0 / (values[1] - values[0])
+        return None
+
+    def rows_in_range(self, x_column, x_min=None, x_max=None):
+        """
+        Rows whose X value lies in [x_min, x_max]
+        :return: slice, from index arithmetic on a uniform timebase or a binary
+                 search on a sorted X column; boolean mask for unsorted X data
+        """
+        if not self.owns(x_column) and self.parent is not None and x_column in self.parent:
+            return self.parent.rows_in_range(x_column, x_min, x_max)
+        timebase = self.timebase(x_column)
+        if timebase is not None:
+            return timebase.slice_between(x_min, x_max)
+        x_values = self[x_column]
+        if x_column not in self.sorted_columns:
+            self.sorted_columns[x_column] = is_sorted(x_values)
+        if self.sorted_columns[x_column]:
+            start = 0 if x_min is None else int(np.searchsorted(x_values, x_min, side='left'))
+            stop = len(x_values) if x_max is None else int(np.searchsorted(x_values, x_max, side='right'))
+            return slice(start, max(stop, start))
+        mask = np.ones(len(x_values), dtype=bool)
+        if x_min is not None:
+            mask &= x_values >= x_min
+        if x_max is not None:
+            mask &= x_values <= x_max
+        return mask
+
+    def column_rows(self, name, rows):
+        """
+        Values of a column restricted to `rows`. A slice gives a zero-copy view
+        of the stored array (or generates only that part of a timebase).
+        """
+        timebase = self.timebase(name)
+        if timebase is not None and isinstance(rows, slice):
+            return timebase.values(rows.start, rows.stop)
+        if timebase is not None and np.issubdtype(np.asarray(rows).dtype, np.integer):
+            return timebase.take(rows)
+        return self[name][rows]
+
+    def release(self, names):
+        """Drop columns that can be loaded again (layers keep their own columns)"""
+        if self.loader is None:
+            return
+        for name in names:
+            self.arrays.pop(name, None)
+            self.matrix_of.pop(name, None)
+            self.last_used.pop(name, None)
+
+    def nbytes(self):
+        """
+        RAM held by the columns stored in this layer (memory-mapped columns live
+        in the page cache, inherited columns are counted by the parent)
+        """
+        total = 0
+        counted = set()
+        for name, values in self.arrays.items():
+            if name in self.matrix_of:
+                values = self.matrix_of[name].data
+            if isinstance(values, np.memmap) or id(values) in counted:
+                continue
+            counted.add(id(values))
+            total += values.nbytes
+        return total + sum(pyramid.nbytes() for pyramid in self.pyramids.values())
+
+    def trim(self, keep, budget):
+        """
+        Release least recently used columns not in `keep` until the loaded
+        columns fit in `budget` bytes
+        """
+        candidates = sorted((name for name in self.arrays if name not in keep),
+                            key=lambda name: self.last_used.get(name, -1))
+        for name in candidates:
+            if self.nbytes() <= budget:
+                break
+            self.release([name])
+
+    def head(self, n=20):
+        if self.preview is not None:
+            return self.preview.head(n)
+        if self.parent is not None:
+            return self.parent.head(n)
+        return pd.DataFrame({column: self.column_rows(column, slice(0, n)) for column in self.columns
+                             if self.is_loaded(column)})
+
+    def to_frame(self, names=None, rows=None):
+        """
+        DataFrame of the given columns (loads them if needed)
+        :param rows: optional slice or mask from rows_in_range
+        """
+        names = self.columns if names is None else names
+        if rows is None:
+            return pd.DataFrame({name: self[name] for name in names}, copy=False)
+        return pd.DataFrame({name: self.column_rows(name, rows) for name in names}, copy=False)
+
+
+class CsvColumnLoader:
+    """
+    Read selected columns of a CSV file, from its binary cache when there is one
+    written with the same channel dtype (`float_dtype`), otherwise parsed with
+    the same dtype plan as a full load
+    """
+
+    def __init__(self, file_path, engine='pandas', float_dtype=np.float64):
+        self.file_path = file_path
+        self.engine = engine
+        self.float_dtype = np.dtype(float_dtype)
+        self.dtype_plan = None
+
+    def __call__(self, names):
+        arrays = load_column_cache(self.file_path, names, self.float_dtype)
+        if arrays is None:
+            if self.dtype_plan is None:
+                columns = pd.read_csv(self.file_path, nrows=0).columns.tolist()
+                self.dtype_plan = csv_dtype_plan(self.file_path, columns, self.float_dtype)
+            df = pd.read_csv(self.file_path, usecols=names, engine='pyarrow' if self.engine == 'pyarrow' else 'c',
+                             dtype={name: self.dtype_plan[name] for name in names if name in self.dtype_plan})
+            arrays = {name: df[name].to_numpy() for name in names}
+        return arrays
+
+
+def columnar_format(file_path):
+    """:return: 'parquet', 'feather', 'hdf5' or None for anything else (CSV)"""
+    return COLUMNAR_FORMATS.get(os.path.splitext(file_path)[1].lower())
+
+
+def hdf5_key(store):
+    """
+    Key of the table to read from an HDF5 store: HDF5_KEY for files written by
+    this program, otherwise the store's only key
+    """
+    keys = store.keys()
+    if '/' + HDF5_KEY in keys:
+        return HDF5_KEY
+    if len(keys) == 1:
+        return keys[0]
+    raise ValueError(f"HDF5 file has several tables {keys}, expected one or '{HDF5_KEY}'")
+
+
+def read_columnar_schema(file_path):
+    """
+    Read column names and row count of a columnar file without loading data
+    :return: (columns, n_rows)
+    """
+    fmt = columnar_format(file_path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(file_path)
+        return parquet_file.schema_arrow.names, parquet_file.metadata.num_rows
+    if fmt == 'feather':
+        import pyarrow as pa
+        with pa.memory_map(file_path) as source:
+            reader = pa.ipc.open_file(source)
+            n_rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+            return reader.schema.names, n_rows
+    if fmt == 'hdf5':
+        with pd.HDFStore(file_path, mode='r') as store:
+            key = hdf5_key(store)
+            storer = store.get_storer(key)
+            columns = store.select(key, start=0, stop=0).columns.tolist()
+            # Fixed format stores have no row count, only the frame's shape
+            n_rows = int(storer.nrows if storer.is_table else storer.shape[0])
+            return columns, n_rows
+    raise ValueError(f"Unsupported file format: {file_path}")
+
+
+def read_columnar(file_path, columns=None, start=0, stop=None):
+    """
+    Read a Parquet, Feather/Arrow IPC or HDF5 file
+    :param columns: subset of columns to read (None = all)
+    :param start: first row to read
+    :param stop: row to stop at (None = end of file)
+    :return: dict of column arrays
+    """
+    fmt = columnar_format(file_path)
+    if fmt == 'hdf5':
+        with pd.HDFStore(file_path, mode='r') as store:
+            key = hdf5_key(store)
+            if store.get_storer(key).is_table:
+                df = store.select(key, columns=columns, start=start, stop=stop)
+            else:
+                # Fixed format cannot select columns, read the rows and pick them afterwards
+                df = store.select(key, start=start, stop=stop)
+                if columns is not None:
+                    df = df[columns]
+        return {column: df[column].to_numpy() for column in df.columns}
+
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(file_path)
+        n_rows = parquet_file.metadata.num_rows
+        stop = n_rows if stop is None else min(stop, n_rows)
+        # Only decode the row groups overlapping [start, stop)
+        groups = []
+        first_row = None
+        group_start = 0
+        for i in range(parquet_file.num_row_groups):
+            group_stop = group_start + parquet_file.metadata.row_group(i).num_rows
+            if group_stop > start and group_start < stop:
+                groups.append(i)
+                if first_row is None:
+                    first_row = group_start
+            group_start = group_stop
+        if not groups:
+            table = parquet_file.schema_arrow.empty_table()
+            if columns is not None:
+                table = table.select(columns)
+        else:
+            table = parquet_file.read_row_groups(groups, columns=columns)
+            table = table.slice(start - first_row, stop - start)
+    elif fmt == 'feather':
+        from pyarrow import feather
+        table = feather.read_table(file_path, columns=columns, memory_map=True)
+        stop = table.num_rows if stop is None else min(stop, table.num_rows)
+        table = table.slice(start, max(stop - start, 0))
+    else:
+        raise ValueError(f"Unsupported file format: {file_path}")
+    return {name: table.column(name).to_numpy() for name in table.column_names}
+
+
+def write_columnar(file_path, dataset):
+    """Save every column of a dataset as Parquet, Feather/Arrow IPC or HDF5"""
+    fmt = columnar_format(file_path)
+    if fmt == 'hdf5':
+        dataset.to_frame().to_hdf(file_path, key=HDF5_KEY, mode='w', format='table')
+        return
+    import pyarrow as pa
+    table = pa.table({column: dataset[column] for column in dataset.columns})
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, file_path)
+    elif fmt == 'feather':
+        from pyarrow import feather
+        # Uncompressed so the file can be memory-mapped without decoding
+        feather.write_feather(table, file_path, compression='uncompressed')
+    else:
+        raise ValueError(f"Unsupported file format: {file_path}")
+
+
+class ColumnarLoader:
+    """Read selected columns of a Parquet, Feather or HDF5 file"""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def __call__(self, names):
+        return read_columnar(self.file_path, names)
+
+
+def file_fingerprint(file_path):
+    """Hash of the file size plus its first and last CACHE_HASH_BYTES bytes"""
+    size = os.path.getsize(file_path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(file_path, 'rb') as fh:
+        digest.update(fh.read(CACHE_HASH_BYTES))
+        if size > CACHE_HASH_BYTES:
+            fh.seek(max(size - CACHE_HASH_BYTES, CACHE_HASH_BYTES))
+            digest.update(fh.read())
+    return digest.hexdigest()
+
+
+def save_column_cache(file_path, dataset, float_dtype=np.float64):
+    """
+    Write the columns of a loaded CSV as raw binary files so the next load
+    can memory-map them instead of parsing text. The channel matrix is written
+    as one (channels x samples) file, other columns one file each. Files with
+    non-numeric columns are not cached.
+    :param float_dtype: channel dtype the file was parsed with, loads asking for another one miss the cache
+    """
+    if not all(dataset.timebase(column) is not None or np.issubdtype(dataset[column].dtype, np.number)
+               for column in dataset.columns):
+        return
+    cache_dir = file_path + CACHE_SUFFIX
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        columns = []
+        matrix = None
+        for i, column in enumerate(dataset.columns):
+            timebase = dataset.timebase(column)
+            if timebase is not None:
+                columns.append({'name': column, 'timebase': [timebase.t0, timebase.dt, timebase.n]})
+                continue
+            if column in dataset.matrix_of and matrix in (None, dataset.matrix_of[column]):
+                matrix = dataset.matrix_of[column]
+                columns.append({'name': column, 'matrix_row': matrix.index[column]})
+                continue
+            values = dataset[column]
+            values = values.astype(values.dtype.newbyteorder('<'), copy=False)
+            name = f'col_{i}.bin'
+            values.tofile(os.path.join(cache_dir, name))
+            columns.append({'name': column, 'dtype': values.dtype.str, 'file': name})
+        for i, column in enumerate(columns):
+            pyramid = dataset.pyramids.get(column['name'])
+            if pyramid is not None and pyramid.levels:
+                name = f'pyramid_{i}.bin'
+                np.concatenate(pyramid.levels, axis=1).astype('<i8').tofile(os.path.join(cache_dir, name))
+                column['pyramid'] = {'file': name, 'block_sizes': pyramid.block_sizes,
+                                     'blocks': [level.shape[1] for level in pyramid.levels]}
+        matrix_meta = None
+        if matrix is not None:
+            data = matrix.data.astype(matrix.data.dtype.newbyteorder('<'), copy=False)
+            data.tofile(os.path.join(cache_dir, 'matrix.bin'))
+            matrix_meta = {'file': 'matrix.bin', 'dtype': data.dtype.str, 'names': matrix.names}
+        stat = os.stat(file_path)
+        meta = {
+            'version': CACHE_VERSION,
+            'file_size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'hash': file_fingerprint(file_path),
+            'rows': len(dataset),
+            'float_dtype': np.dtype(float_dtype).str,
+            'columns': columns,
+            'matrix': matrix_meta,
+        }
+        # meta.json is written last so an interrupted write never looks valid
+        with open(meta_path, 'w') as fh:
+            json.dump(meta, fh)
+    except OSError as e:
+        print(f"Could not write cache for {file_path}: {e}")
+
+
+def read_cache_meta(file_path, float_dtype=None):
+    """
+    :param float_dtype: channel dtype wanted, a cache written with another one is not used (None = any)
+    :return: metadata of the binary cache of a file, or None if missing, stale or of another dtype
+    """
+    try:
+        with open(os.path.join(file_path + CACHE_SUFFIX, 'meta.json')) as fh:
+            meta = json.load(fh)
+        stat = os.stat(file_path)
+        if (meta.get('version') != CACHE_VERSION or meta['file_size'] != stat.st_size
+                or meta['mtime'] != stat.st_mtime or meta['hash'] != file_fingerprint(file_path)):
+            return None
+        if float_dtype is not None and meta['float_dtype'] != np.dtype(float_dtype).str:
+            return None
+    except (OSError, ValueError, KeyError):
+        return None
+    return meta
+
+
+def load_pyramid_cache(file_path):
+    """:return: dict of memory-mapped MinMaxPyramids saved with the binary cache"""
+    meta = read_cache_meta(file_path)
+    if meta is None:
+        return {}
+    pyramids = {}
+    try:
+        for column in meta['columns']:
+            if 'pyramid' not in column:
+                continue
+            info = column['pyramid']
+            data = np.memmap(os.path.join(file_path + CACHE_SUFFIX, info['file']), dtype='<i8', mode='r',
+                             shape=(2, sum(info['blocks'])))
+            bounds = np.cumsum([0] + info['blocks'])
+            pyramids[column['name']] = MinMaxPyramid(
+                info['block_sizes'], [data[:, lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])])
+    except (OSError, ValueError, KeyError):
+        return {}
+    return pyramids
+
+
+def load_column_cache(file_path, columns=None, float_dtype=None):
+    """
+    Open the binary cache of a CSV file with np.memmap
+    :param columns: optional subset of columns to open
+    :param float_dtype: channel dtype wanted (None = whatever was cached)
+    :return: dict of read-only memory-mapped columns (channels of the cached
+             matrix map to one shared ChannelMatrix), or None if there is no
+             cache or it does not match the file anymore
+    """
+    cache_dir = file_path + CACHE_SUFFIX
+    meta = read_cache_meta(file_path, float_dtype)
+    if meta is None:
+        return None
+    try:
+        cached = {column['name']: column for column in meta['columns']}
+        matrix = None
+        if meta['matrix'] is not None and meta['rows'] > 0:
+            data = np.memmap(os.path.join(cache_dir, meta['matrix']['file']), dtype=meta['matrix']['dtype'],
+                             mode='r', shape=(len(meta['matrix']['names']), meta['rows']))
+            matrix = ChannelMatrix(meta['matrix']['names'], data)
+        arrays = {}
+        for name in (cached if columns is None else columns):
+            column = cached[name]
+            if 'matrix_row' in column:
+                arrays[name] = matrix if matrix is not None else np.empty(0, dtype=meta['matrix']['dtype'])
+            elif 'timebase' in column:
+                arrays[name] = UniformTimebase(*column['timebase'])
+            elif meta['rows'] == 0:
+                arrays[name] = np.empty(0, dtype=column['dtype'])
+            else:
+                arrays[name] = np.memmap(os.path.join(cache_dir, column['file']),
+                                         dtype=column['dtype'], mode='r', shape=(meta['rows'],))
+    except (OSError, ValueError, KeyError):
+        return None
+    return arrays
+
+
+def csv_dtype_plan(file_path, columns, float_dtype=np.float64):
+    """
+    Decide the dtype of every numeric column from a sample of the file, so the
+    parser writes channels straight into float buffers of the requested width.
+    The first column (the time axis) always stays float64.
+    """
+    sample = pd.read_csv(file_path, nrows=1000)
+    plan = {}
+    for i, column in enumerate(columns):
+        if column in sample and pd.api.types.is_numeric_dtype(sample[column].dtype):
+            plan[column] = np.dtype(np.float64 if i == 0 else float_dtype)
+    return plan
+
+
+def parse_csv_block(data, columns, dtype_plan=None, engine='pandas'):
+    """
+    Parse a block of complete CSV lines (no header)
+    :param engine: 'pandas' (single-threaded C parser) or 'pyarrow' (multi-threaded)
+    :return: DataFrame
+    """
+    dtype_plan = dtype_plan or {}
+    if engine == 'pyarrow':
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+        table = pa_csv.read_csv(
+            io.BytesIO(data),
+            read_options=pa_csv.ReadOptions(column_names=columns, use_threads=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.from_numpy_dtype(dtype) for name, dtype in dtype_plan.items()}))
+        return pd.DataFrame({name: table.column(name).to_numpy() for name in columns}, copy=False)
+    return pd.read_csv(io.BytesIO(data), header=None, names=columns, dtype=dtype_plan)
+
+
+class CsvLoadWorker(QObject):
+    """
+    Parse a CSV file block by block on a worker thread.
+    Emits the first rows as soon as they are parsed so the preview table can be
+    filled immediately, reports progress per block and finally the full dataset
+    together with the sidecar index built during the same pass.
+    """
+    preview_ready = pyqtSignal(object)
+    progress = pyqtSignal(int, int, int)
+    loaded = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, engine='pandas', float_dtype=np.float64, block_size=None,
+                 preview_rows=20, save_sidecars=True):
+        super().__init__()
+        self.file_path = file_path
+        self.engine = engine
+        self.float_dtype = float_dtype
+        if block_size is None:
+            block_size = ARROW_CSV_BLOCK_SIZE if engine == 'pyarrow' else CSV_BLOCK_SIZE
+        self.block_size = block_size
+        self.preview_rows = preview_rows
+        self.save_sidecars = save_sidecars
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            result = self.read()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if result is None:
+            self.failed.emit("Loading cancelled")
+        else:
+            self.loaded.emit(*result)
+
+    def read(self):
+        """
+        Read the whole file in a single pass
+        :return: (SignalDataset, index), or None if the load was cancelled
+        """
+        total_bytes = os.path.getsize(self.file_path)
+        with open(self.file_path, 'rb') as fh:
+            header = fh.readline()
+            columns = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+            dtype_plan = csv_dtype_plan(self.file_path, columns, self.float_dtype)
+            bytes_read = len(header)
+            data_offset = len(header)
+            index_builder = CsvIndexBuilder(self.file_path, columns, len(header))
+            buffers = None
+            matrix_buffer = None
+            n_rows = 0
+            tail = b''
+            while True:
+                if self._cancelled:
+                    return None
+                block = fh.read(self.block_size)
+                if block:
+                    data = tail + block
+                    # Only parse complete lines, carry the partial last line over
+                    cut = data.rfind(b'\n') + 1
+                    data, tail = data[:cut], data[cut:]
+                else:
+                    data, tail = tail, b''
+                if data.strip():
+                    chunk = parse_csv_block(data, columns, dtype_plan, self.engine)
+                    if buffers is None:
+                        self.preview_ready.emit(chunk.head(self.preview_rows))
+                        # Size the buffers from the bytes per row of the first block
+                        estimated_rows = int(len(chunk) * (total_bytes / max(bytes_read + len(data), 1)) * 1.02)
+                        # Float channels go into one channel matrix, anything else into its own column
+                        channels = [column for column in columns[1:]
+                                    if column in dtype_plan and chunk[column].dtype == dtype_plan[column]]
+                        matrix_buffer = MatrixBuffer(len(channels), self.float_dtype, estimated_rows) \
+                            if channels else None
+                        # Extension dtypes (e.g. pandas strings) are stored as their NumPy equivalent
+                        buffers = {column: ColumnBuffer(chunk[column].to_numpy().dtype, estimated_rows)
+                                   for column in columns if column not in channels}
+                    if matrix_buffer is not None:
+                        matrix_buffer.append([chunk[column].to_numpy() for column in channels])
+                    for column in buffers:
+                        buffers[column].append(chunk[column].to_numpy())
+                    index_builder.add_block(data, data_offset, chunk)
+                    n_rows += len(chunk)
+                    del chunk
+                data_offset += len(data)
+                bytes_read += len(block)
+                self.progress.emit(bytes_read, total_bytes, n_rows)
+                if not block:
+                    break
+
+        index = index_builder.finish()
+        if self.save_sidecars:
+            save_index(self.file_path, index)
+        if buffers is None:
+            return SignalDataset(columns, 0, {column: np.empty(0) for column in columns}), index
+        arrays = {column: buffers[column].values() for column in buffers}
+        if matrix_buffer is not None:
+            matrix = ChannelMatrix(channels, matrix_buffer.values())
+            arrays.update({column: matrix for column in channels})
+        dataset = SignalDataset(columns, n_rows, {column: arrays[column] for column in columns})
+        dataset.build_pyramids()
+        if self.save_sidecars:
+            save_column_cache(self.file_path, dataset, self.float_dtype)
+        return dataset, index
+
+
+def benchmark_csv_engines(n_rows=5_000_000, n_channels=4):
+    """
+    Time the background CSV loader with both parsing engines on a generated
+    file of `n_rows` samples x `n_channels` channels plus a time column
+    """
+    fs = 100000.0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'benchmark.csv')
+        rng = np.random.default_rng(0)
+        data = {'Time (s)': np.arange(n_rows) / fs}
+        for channel in range(n_channels):
+            data[f'Channel {channel}'] = rng.standard_normal(n_rows)
+        pd.DataFrame(data).to_csv(file_path, index=False)
+        del data
+        size_mb = os.path.getsize(file_path) / 1024 / 1024
+
+        print(f"CSV load benchmark: {n_rows:,} rows x {n_channels} channels ({size_mb:.0f} MB)")
+        print(f"{'engine':<10}{'dtype':<10}{'seconds':>10}{'MB/s':>10}{'speedup':>10}")
+        baseline = None
+        for engine in ('pandas', 'pyarrow'):
+            for float_dtype in (np.float64, np.float32):
+                worker = CsvLoadWorker(file_path, engine, float_dtype, save_sidecars=False)
+                start = time.perf_counter()
+                worker.read()
+                elapsed = time.perf_counter() - start
+                if baseline is None:
+                    baseline = elapsed
+                print(f"{engine:<10}{np.dtype(float_dtype).name:<10}{elapsed:>10.2f}"
+                      f"{size_mb / elapsed:>10.1f}{baseline / elapsed:>9.1f}x")
+
+
+def benchmark_fft_lengths(sizes=FFT_BENCHMARK_SIZES, repeats=3):
+    """
+    Time a real FFT at each of `sizes`, at the next prime length above it and
+    at the fast lengths next_fast_len() rounds both up to
+    """
+    rng = np.random.default_rng(0)
+    print(f"{'length':>12}{'max prime':>12}{'ms':>10}{'fast length':>14}{'ms':>10}{'speedup':>10}")
+    for size in sizes:
+        prime = size + 1
+        while largest_prime_factor(prime) != prime:
+            prime += 1
+        for n in (size, prime):
+            timings = []
+            for length in (n, next_fast_len(n, real=True)):
+                data = rng.standard_normal(length)
+                rfft(data, workers=-1)
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    rfft(data, workers=-1)
+                timings.append((time.perf_counter() - start) / repeats * 1000)
+            print(f"{n:>12,}{largest_prime_factor(n):>12,}{timings[0]:>10.2f}"
+                  f"{next_fast_len(n, real=True):>14,}{timings[1]:>10.2f}{timings[0] / timings[1]:>9.1f}x")
+
+
+class BlitDragger:
+    """
+    Redraws only the dragged artists over a cached background while the mouse
+    moves, instead of re-rasterising every line of the figure per motion event
+    """
+
+    def __init__(self, canvas, artists):
+        self.canvas = canvas
+        self.artists = list(artists)
+        for artist in self.artists:
+            artist.set_animated(True)
+        # One full draw without the dragged artists gives the static background
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.update()
+
+    def update(self):
+        self.canvas.restore_region(self.background)
+        for artist in self.artists:
+            self.canvas.figure.draw_artist(artist)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def finish(self):
+        """Put the artists back into the normal draw"""
+        for artist in self.artists:
+            artist.set_animated(False)
+        self.canvas.draw_idle()
+
+
+class RedrawScheduler(QObject):
+    """
+    Central scheduler for canvas redraws and parameter-driven recomputations.
+    Every draw requested for a canvas during a frame is coalesced into one
+    draw, and debounced jobs only run after their parameters stopped changing.
+    Requested and performed counts are kept per canvas/job for profiling.
+    """
+
+    def __init__(self, parent=None, frame_ms=REDRAW_FRAME_MS, debounce_ms=PARAMETER_DEBOUNCE_MS):
+        super().__init__(parent)
+        self.debounce_ms = debounce_ms
+        self.pending = []
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(frame_ms)
+        self.frame_timer.timeout.connect(self.flush)
+        # Debounce timer and latest callback of every job
+        self.jobs = {}
+        self.callbacks = {}
+        self.requested = {}
+        self.performed = {}
+
+    @staticmethod
+    def count(counter, name):
+        counter[name] = counter.get(name, 0) + 1
+
+    def draw(self, canvas):
+        """Redraw `canvas` at the end of the current frame"""
+        self.count(self.requested, canvas.objectName())
+        if canvas not in self.pending:
+            self.pending.append(canvas)
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def flush(self):
+        pending, self.pending = self.pending, []
+        for canvas in pending:
+            self.count(self.performed, canvas.objectName())
+            canvas.draw()
+
+    def debounce(self, name, callback):
+        """Run `callback` once no other request for job `name` came in for the debounce delay"""
+        self.count(self.requested, name)
+        self.callbacks[name] = callback
+        timer = self.jobs.get(name)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(self.debounce_ms)
+            timer.timeout.connect(lambda: self.run(name))
+            self.jobs[name] = timer
+        timer.start()
+
+    def run(self, name):
+        self.count(self.performed, name)
+        self.callbacks.pop(name)()
+
+    def stats(self):
+        """:return: {canvas or job name: (requested, performed)}"""
+        return {name: (requested, self.performed.get(name, 0)) for name, requested in self.requested.items()}
+
+    def report(self):
+        print(f"{'canvas/job':<16}{'requested':>10}{'performed':>10}")
+        for name, (requested, performed) in sorted(self.stats().items()):
+            print(f"{name:<16}{requested:>10}{performed:>10}")
+
+
+class FastSignalView(QWidget):
+    """
+    Signal tab renderer based on pyqtgraph. Lines are painted directly with
+    QPainter instead of being rasterised into a matplotlib figure, so panning a
+    full recording stays interactive on a CPU-only machine. Data still comes
+    from the same decimation as the matplotlib view.
+    pyqtgraph is optional and only imported when the view is created.
+    """
+    # Visible X range or plot width changed
+    range_changed = pyqtSignal()
+    # Click in data coordinates: (x, y, button) with button 1 = left, 3 = right
+    clicked = pyqtSignal(float, float, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        import pyqtgraph as pg
+        self.pg = pg
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.plot_widget = pg.PlotWidget(background='w')
+        self.plot_item = self.plot_widget.getPlotItem()
+        self.plot_item.setMenuEnabled(False)
+        self.legend = self.plot_item.addLegend()
+        self.lines = {}
+        self.overlay = []
+        layout.addWidget(self.plot_widget)
+        self.plot_item.sigXRangeChanged.connect(lambda *args: self.range_changed.emit())
+        self.plot_item.vb.sigResized.connect(lambda *args: self.range_changed.emit())
+        self.plot_widget.scene().sigMouseClicked.connect(self.on_mouse_clicked)
+
+    def set_lines(self, styles):
+        """:param styles: {name: (color, width)} of the lines to show, in legend order"""
+        for name in [name for name in self.lines if name not in styles]:
+            self.plot_item.removeItem(self.lines.pop(name))
+        self.legend.clear()
+        for name, (color, width) in styles.items():
+            if name not in self.lines:
+                self.lines[name] = self.plot_item.plot([], [])
+            self.lines[name].setPen(self.pg.mkPen(to_hex(color), width=width))
+            self.legend.addItem(self.lines[name], name)
+
+    def set_line_data(self, name, x, y):
+        self.lines[name].setData(x, y, skipFiniteCheck=True)
+
+    def set_labels(self, title, x_label, y_label):
+        self.plot_item.setTitle(title)
+        self.plot_item.setLabel('bottom', x_label)
+        self.plot_item.setLabel('left', y_label)
+
+    def auto_range(self):
+        self.plot_item.autoRange()
+
+    def x_range(self):
+        return tuple(sorted(self.plot_item.vb.viewRange()[0]))
+
+    def pixel_width(self):
+        return int(self.plot_item.vb.width())
+
+    def to_display(self, x, y):
+        """Data coordinates to pixels (up to an offset, which picking does not need)"""
+        x_per_pixel, y_per_pixel = self.plot_item.vb.viewPixelSize()
+        return np.asarray(x) / x_per_pixel, np.asarray(y) / y_per_pixel
+
+    def pick_range(self, x, radius):
+        """X range within `radius` pixels of x"""
+        x_per_pixel = self.plot_item.vb.viewPixelSize()[0]
+        return x - radius * x_per_pixel, x + radius * x_per_pixel
+
+    def toggle_legend(self):
+        self.legend.setVisible(not self.legend.isVisible())
+
+    def add_marker(self, x, y, color):
+        self.add_overlay(self.pg.ScatterPlotItem([x], [y], size=10, pen=self.pg.mkPen('k'),
+                                                 brush=self.pg.mkBrush(to_hex(color))))
+
+    def add_segment(self, x1, y1, x2, y2):
+        self.add_overlay(self.pg.PlotDataItem([x1, x2], [y1, y2], pen=self.pg.mkPen('k', width=2)))
+
+    def add_text(self, text, x, y):
+        item = self.pg.TextItem(text, color='k', border='k', fill=self.pg.mkBrush(255, 255, 224, 230))
+        item.setPos(x, y)
+        self.add_overlay(item)
+
+    def add_overlay(self, item):
+        self.plot_item.addItem(item, ignoreBounds=True)
+        self.overlay.append(item)
+
+    def clear_overlay(self):
+        for item in self.overlay:
+            self.plot_item.removeItem(item)
+        self.overlay.clear()
+
+    def on_mouse_clicked(self, event):
+        position = event.scenePos()
+        if not self.plot_item.vb.sceneBoundingRect().contains(position):
+            return
+        button = {Qt.MouseButton.LeftButton: 1, Qt.MouseButton.RightButton: 3}.get(event.button())
+        if button is not None:
+            point = self.plot_item.vb.mapSceneToView(position)
+            self.clicked.emit(point.x(), point.y(), button)
+
+
 class SignalAnalyzer(QMainWindow):
     def __init__(self, parent=None):
         super().__init__()
@@ -33,6 +1766,7 @@ class SignalAnalyzer(QMainWindow):
         self.selected_points = []
         self.dragging_annotation = None
         self.drag_offset = (0, 0)
+        self.drag_blitter = None
         self.signal_colors = {}
         self.current_ax = None
         self.plotted_signals = {}
@@ -40,14 +1774,46 @@ class SignalAnalyzer(QMainWindow):
         self.signal_axes = []
         self.active_plot_channels = set()
         self.plotted_lines = []
+        self.ax = None
+        # Line2D of every plotted channel, reused between replots
+        self.signal_lines = {}
+        # Line color and LinePickIndex of every plotted channel
+        self.line_colors = {}
+        self.pick_indexes = {}
+        # pyqtgraph view, created the first time the fast renderer is selected
+        self.fast_view = None
+        # Labels/legend state per figure, tight_layout() only runs when it changes
+        self.layout_keys = {}
+        # (dataset, x column, rows) behind the plotted lines, used to re-decimate on zoom
+        self.plot_source = None
+        self.decimated_view = None
         self.is_normalized = False
         self.is_filtered = False
         self.sampling_rate = 100000
+        # Coalesces canvas redraws and debounces parameter edits
+        self.scheduler = RedrawScheduler(self)
+
+        # Background loader attributes
+        self.load_thread = None
+        self.load_worker = None
+        self.loading_file_path = None
+        # (file path, sidecar index) of the open file, for refreshing its summary
+        self.file_summary = None
 
         # FFT attributes
         self.fft_figure = None
         self.fft_canvas = None
+        self.fft_toolbar = None
         self.fft_ax = None
+        # The FFT is outdated and is recomputed when its tab is shown
+        self.fft_stale = False
+        # FFT line of every channel, the full-resolution (frequencies, values)
+        # behind it and the LinePickIndex of that spectrum
+        self.fft_lines = {}
+        self.fft_spectra = {}
+        self.fft_pick_indexes = {}
+        # Raw spectra, normalization/smoothing/range/scale are applied on display
+        self.spectrum_cache = SpectrumCache(SPECTRUM_CACHE_MB * 1024 * 1024)
         self.fft_annotations = []
         self.fft_markers = []
         self.fft_selected_points = []
@@ -62,11 +1828,21 @@ class SignalAnalyzer(QMainWindow):
         self.drag_start_y = None
         self.drag_annotation_start_X = None
         self.drag_annotation_start_Y = None
+        self.fft_drag_blitter = None
 
         # CWT attributes
         self.cwt_figure = None
         self.cwt_canvas = None
+        self.cwt_toolbar = None
         self.cwt_ax = None
+        self.cwt_stale = False
+        # (image, colorbar) of every channel, reused between recalculations
+        self.cwt_images = {}
+        # Full-resolution |coefficients| of every channel, the (t0, t1, n_samples)
+        # time span behind them and the (start, stop, width) currently imaged
+        self.cwt_magnitudes = {}
+        self.cwt_time = None
+        self.cwt_pooled_view = None
         self.cwt_annotations = []
         self.cwt_markers = []
         # CWT parameters
@@ -96,7 +1872,8 @@ class SignalAnalyzer(QMainWindow):
         header_layout.setContentsMargins(10, 2, 10, 2)
         header_layout.setSpacing(5)
 
-        self.load_btn = QPushButton('📁 Load CSV')
+        self.load_btn = QPushButton('📁 Load File')
+        self.export_btn = QPushButton('💾 Export')
         self.plot_btn = QPushButton('📊 Graph')
         self.clear_btn = QPushButton('🧹 Clear all')
         self.legend_btn = QPushButton('📋 Legend')
@@ -115,10 +1892,11 @@ class SignalAnalyzer(QMainWindow):
             QPushButton:pressed { background-color: #d8d8d8; }
         """
 
-        for btn in [self.load_btn, self.plot_btn, self.clear_btn, self.normalized_btn, self.fft_btn, self.cwt_btn]:
+        for btn in [self.load_btn, self.export_btn, self.plot_btn, self.clear_btn, self.normalized_btn, self.fft_btn, self.cwt_btn]:
             btn.setStyleSheet(button_style)
 
         header_layout.addWidget(self.load_btn)
+        header_layout.addWidget(self.export_btn)
         header_layout.addWidget(self.plot_btn)
         header_layout.addWidget(self.clear_btn)
         header_layout.addWidget(self.legend_btn)
@@ -221,6 +1999,20 @@ class SignalAnalyzer(QMainWindow):
         self.line_input = QLineEdit('1')
         plot_controls_layout.addWidget(self.line_input, 4, 1)
 
+        plot_controls_layout.addWidget(QLabel("Downsampling:"), 5, 0)
+        self.downsampling_mode = QComboBox()
+        self.downsampling_mode.addItems(DOWNSAMPLING_MODES)
+        self.downsampling_mode.setToolTip("Min/Max keeps spikes, LTTB keeps the shape of smooth signals, "
+                                          "None draws every sample")
+        plot_controls_layout.addWidget(self.downsampling_mode, 5, 1)
+
+        plot_controls_layout.addWidget(QLabel("Renderer:"), 6, 0)
+        self.renderer = QComboBox()
+        self.renderer.addItems(SIGNAL_RENDERERS)
+        self.renderer.setToolTip("pyqtgraph draws the Signal tab with QPainter for fast panning "
+                                 "(requires the pyqtgraph package)")
+        plot_controls_layout.addWidget(self.renderer, 6, 1)
+
         graph_layout.addWidget(plot_controls_group)
         graph_layout.addStretch()
 
@@ -293,73 +2085,106 @@ class SignalAnalyzer(QMainWindow):
         fft_grid.addWidget(self.fft_sampling_rate, 0, 1)
         fft_grid.addWidget(QLabel("Hz"), 0, 2)
 
+        # Spectrum method: Welch averaged PSD or a single FFT of the whole range
+        fft_grid.addWidget(QLabel("Method:"), 1, 0)
+        self.spectrum_method = QComboBox()
+        self.spectrum_method.addItems(SPECTRUM_METHODS)
+        fft_grid.addWidget(self.spectrum_method, 1, 1, 1, 2)
+
+        # Welch parameters (pre-defined, will be shown/hidden)
+        self.welch_segment_label = QLabel("Segment Length:")
+        self.welch_segment_input = QLineEdit('Auto')
+        self.welch_segment_input.setToolTip(
+            f"Samples per segment, or Auto to split the X range into {WELCH_AUTO_SEGMENTS} segments")
+        self.welch_segment_unit = QLabel("samples")
+        fft_grid.addWidget(self.welch_segment_label, 2, 0)
+        fft_grid.addWidget(self.welch_segment_input, 2, 1)
+        fft_grid.addWidget(self.welch_segment_unit, 2, 2)
+
+        self.welch_overlap_label = QLabel("Overlap:")
+        self.welch_overlap_input = QLineEdit('50')
+        self.welch_overlap_unit = QLabel("%")
+        fft_grid.addWidget(self.welch_overlap_label, 3, 0)
+        fft_grid.addWidget(self.welch_overlap_input, 3, 1)
+        fft_grid.addWidget(self.welch_overlap_unit, 3, 2)
+
+        self.welch_average_label = QLabel("Averaging:")
+        self.welch_average = QComboBox()
+        self.welch_average.addItems(["Mean", "Median"])
+        fft_grid.addWidget(self.welch_average_label, 4, 0)
+        fft_grid.addWidget(self.welch_average, 4, 1, 1, 2)
+
         # Window type selection
-        fft_grid.addWidget(QLabel("Window Type:"), 1, 0)
+        fft_grid.addWidget(QLabel("Window Type:"), 5, 0)
         self.window_type = QComboBox()
         self.window_type.addItems(["Rectangular", "Hanning", "Hamming", "Blackman", "Bartlett", "Kaiser"])
-        fft_grid.addWidget(self.window_type, 1, 1, 1, 2)
+        self.window_type.setCurrentText("Hanning")
+        fft_grid.addWidget(self.window_type, 5, 1, 1, 2)
 
         # Kaiser beta parameter (pre-defined, will be shown/hidden)
         self.kaiser_beta_label = QLabel("Kaiser Beta:")
         self.kaiser_beta_input = QLineEdit('14')
-        fft_grid.addWidget(self.kaiser_beta_label, 2, 0)
-        fft_grid.addWidget(self.kaiser_beta_input, 2, 1)
-        fft_grid.addWidget(QLabel(""), 2, 2)
+        fft_grid.addWidget(self.kaiser_beta_label, 6, 0)
+        fft_grid.addWidget(self.kaiser_beta_input, 6, 1)
+        fft_grid.addWidget(QLabel(""), 6, 2)
 
         # Zero padding
-        fft_grid.addWidget(QLabel("Zero Padding:"), 3, 0)
+        self.zero_padding_label = QLabel("Zero Padding:")
+        fft_grid.addWidget(self.zero_padding_label, 7, 0)
         self.zero_padding = QComboBox()
-        self.zero_padding.addItems(["None", "2x", "4x", "8x", "Custom"])
-        fft_grid.addWidget(self.zero_padding, 3, 1, 1, 2)
+        self.zero_padding.addItems(["None", "Fast length", "2x", "4x", "8x", "Custom"])
+        fft_grid.addWidget(self.zero_padding, 7, 1, 1, 2)
 
         # Custom zero padding factor (pre-defined)
         self.custom_padding_label = QLabel("Custom Padding:")
         self.custom_padding_input = QLineEdit('1024')
-        fft_grid.addWidget(self.custom_padding_label, 4, 0)
-        fft_grid.addWidget(self.custom_padding_input, 4, 1)
-        fft_grid.addWidget(QLabel(""), 4, 2)
+        fft_grid.addWidget(self.custom_padding_label, 8, 0)
+        fft_grid.addWidget(self.custom_padding_input, 8, 1)
+        fft_grid.addWidget(QLabel(""), 8, 2)
 
         # Smoothing options
-        fft_grid.addWidget(QLabel("Smoothing:"), 5, 0)
+        fft_grid.addWidget(QLabel("Smoothing:"), 9, 0)
         self.smoothing_type = QComboBox()
         self.smoothing_type.addItems(["None", "Moving Average", "Savitzky-Golay"])
-        fft_grid.addWidget(self.smoothing_type, 5, 1, 1, 2)
+        fft_grid.addWidget(self.smoothing_type, 9, 1, 1, 2)
 
         # Smoothing window size (pre-defined)
         self.smoothing_window_label = QLabel("Smoothing Window:")
         self.smoothing_window_input = QLineEdit('11')
-        fft_grid.addWidget(self.smoothing_window_label, 6, 0)
-        fft_grid.addWidget(self.smoothing_window_input, 6, 1)
-        fft_grid.addWidget(QLabel(""), 6, 2)
+        fft_grid.addWidget(self.smoothing_window_label, 10, 0)
+        fft_grid.addWidget(self.smoothing_window_input, 10, 1)
+        fft_grid.addWidget(QLabel(""), 10, 2)
 
         # Frequency range
-        fft_grid.addWidget(QLabel("Freq Range Min:"), 7, 0)
+        fft_grid.addWidget(QLabel("Freq Range Min:"), 11, 0)
         self.freq_min = QLineEdit('0')
-        fft_grid.addWidget(self.freq_min, 7, 1)
-        fft_grid.addWidget(QLabel("Hz"), 7, 2)
+        fft_grid.addWidget(self.freq_min, 11, 1)
+        fft_grid.addWidget(QLabel("Hz"), 11, 2)
 
-        fft_grid.addWidget(QLabel("Freq Range Max:"), 8, 0)
+        fft_grid.addWidget(QLabel("Freq Range Max:"), 12, 0)
         self.freq_max = QLineEdit('25')
-        fft_grid.addWidget(self.freq_max, 8, 1)
-        fft_grid.addWidget(QLabel("Hz"), 8, 2)
+        fft_grid.addWidget(self.freq_max, 12, 1)
+        fft_grid.addWidget(QLabel("Hz"), 12, 2)
 
         # Y-axis scale
-        fft_grid.addWidget(QLabel("Y Scale:"), 9, 0)
+        fft_grid.addWidget(QLabel("Y Scale:"), 13, 0)
         self.y_scale = QComboBox()
         self.y_scale.addItems(["Linear", "Logarithmic"])
-        fft_grid.addWidget(self.y_scale, 9, 1, 1, 2)
+        fft_grid.addWidget(self.y_scale, 13, 1, 1, 2)
 
-        # Normalization
-        fft_grid.addWidget(QLabel("Normalization:"), 10, 0)
+        # Normalization (the Welch method always gives a PSD)
+        self.fft_normalization_label = QLabel("Normalization:")
+        fft_grid.addWidget(self.fft_normalization_label, 14, 0)
         self.fft_normalization = QComboBox()
         self.fft_normalization.addItems(["None", "Amplitude", "Power", "PSD"])
-        fft_grid.addWidget(self.fft_normalization, 10, 1, 1, 2)
+        fft_grid.addWidget(self.fft_normalization, 14, 1, 1, 2)
 
         # Apply FFT button
         self.apply_fft_btn = QPushButton("Apply FFT")
-        fft_grid.addWidget(self.apply_fft_btn, 11, 0, 1, 3)
+        fft_grid.addWidget(self.apply_fft_btn, 15, 0, 1, 3)
 
         # Connect signals for dynamic UI updates
+        self.spectrum_method.currentTextChanged.connect(self.update_fft_ui)
         self.window_type.currentTextChanged.connect(self.update_fft_ui)
         self.zero_padding.currentTextChanged.connect(self.update_fft_ui)
         self.smoothing_type.currentTextChanged.connect(self.update_fft_ui)
@@ -445,11 +2270,45 @@ class SignalAnalyzer(QMainWindow):
         cwt_scroll.setWidget(cwt_container)
         cwt_layout.addWidget(cwt_scroll)
 
+        """
+        Tab 5: Load Controls
+        """
+        load_tab = QWidget()
+        load_layout = QVBoxLayout(load_tab)
+
+        load_group = QGroupBox("Load Settings")
+        load_grid = QGridLayout(load_group)
+
+        # Lazy mode: read the header only, load channels when they are checked
+        load_grid.addWidget(QLabel("Lazy Columns:"), 0, 0)
+        self.lazy_load_check = QCheckBox("Load channels on demand")
+        load_grid.addWidget(self.lazy_load_check, 0, 1, 1, 2)
+
+        load_grid.addWidget(QLabel("Memory Budget:"), 1, 0)
+        self.memory_budget_input = QLineEdit(str(LAZY_MEMORY_BUDGET_MB))
+        load_grid.addWidget(self.memory_budget_input, 1, 1)
+        load_grid.addWidget(QLabel("MB"), 1, 2)
+
+        # CSV parsing engine and the float width channels are parsed into
+        load_grid.addWidget(QLabel("CSV Engine:"), 2, 0)
+        self.csv_engine = QComboBox()
+        self.csv_engine.addItems(list(CSV_ENGINES))
+        load_grid.addWidget(self.csv_engine, 2, 1, 1, 2)
+
+        load_grid.addWidget(QLabel("Channel Dtype:"), 3, 0)
+        self.channel_dtype = QComboBox()
+        self.channel_dtype.addItems(["float64", "float32"])
+        load_grid.addWidget(self.channel_dtype, 3, 1, 1, 2)
+
+        load_layout.addWidget(load_group)
+        load_layout.addStretch()
+
         # Add all tabs to controls
         controls_tabs.addTab(graph_tab, "Graph Controls")
         controls_tabs.addTab(filters_tab, "Filters Controls")
         controls_tabs.addTab(fft_tab, "FFT Controls")
         controls_tabs.addTab(cwt_tab, "CWT Controls")
+        controls_tabs.addTab(load_tab, "Load Controls")
         left_layout.addWidget(controls_tabs)
 
         """
@@ -480,29 +2339,25 @@ class SignalAnalyzer(QMainWindow):
         # Signal Tab
         self.signal_tab = QWidget()
         signal_tab_layout = QVBoxLayout(self.signal_tab)
+        # matplotlib view, and the optional fast view stacked on top of it
+        self.signal_stack = QStackedWidget()
+        mpl_view = QWidget()
+        mpl_layout = QVBoxLayout(mpl_view)
+        mpl_layout.setContentsMargins(0, 0, 0, 0)
         self.figure = Figure(figsize=(12, 8))
         self.canvas = FigureCanvas(self.figure)
+        self.canvas.setObjectName("signal_canvas")
         self.toolbar = NavigationToolbar(self.canvas, self)
-        signal_tab_layout.addWidget(self.toolbar)
-        signal_tab_layout.addWidget(self.canvas)
+        mpl_layout.addWidget(self.toolbar)
+        mpl_layout.addWidget(self.canvas)
+        self.signal_stack.addWidget(mpl_view)
+        signal_tab_layout.addWidget(self.signal_stack)
 
-        # FFT Tab
+        # FFT and CWT Tabs, their figures are built on first view (build_fft_tab / build_cwt_tab)
         self.fft_tab = QWidget()
-        fft_tab_layout = QVBoxLayout(self.fft_tab)
-        self.fft_figure = Figure(figsize=(12, 8))
-        self.fft_canvas = FigureCanvas(self.fft_figure)
-        self.fft_toolbar = NavigationToolbar(self.fft_canvas, self)
-        fft_tab_layout.addWidget(self.fft_toolbar)
-        fft_tab_layout.addWidget(self.fft_canvas)
-
-        # CWT Tab
+        QVBoxLayout(self.fft_tab)
         self.cwt_tab = QWidget()
-        cwt_tab_layout = QVBoxLayout(self.cwt_tab)
-        self.cwt_figure = Figure(figsize=(12, 8))
-        self.cwt_canvas = FigureCanvas(self.cwt_figure)
-        self.cwt_toolbar = NavigationToolbar(self.cwt_canvas, self)
-        cwt_tab_layout.addWidget(self.cwt_toolbar)
-        cwt_tab_layout.addWidget(self.cwt_canvas)
+        QVBoxLayout(self.cwt_tab)
 
         self.plot_tabs.addTab(self.signal_tab, "Signal")
         self.plot_tabs.addTab(self.fft_tab, "FFT")
@@ -517,6 +2372,7 @@ class SignalAnalyzer(QMainWindow):
         Signal Connectors
         """
         self.load_btn.clicked.connect(self.load_csv)
+        self.export_btn.clicked.connect(self.export_data)
         self.plot_btn.clicked.connect(self.plot_signals)
         self.clear_btn.clicked.connect(self.clear_plot)
         self.legend_btn.clicked.connect(self.toggle_legend)
@@ -528,6 +2384,10 @@ class SignalAnalyzer(QMainWindow):
         self.apply_cwt_btn.clicked.connect(self.calculate_cwt)
         self.apply_fft_btn.clicked.connect(self.calculate_fft)
         self.x_axis_combo.currentTextChanged.connect(self.update_y_columns_list)
+        self.y_columns_list.itemChanged.connect(self.on_y_item_changed)
+        self.x_min_input.editingFinished.connect(self.mark_stale)
+        self.x_max_input.editingFinished.connect(self.mark_stale)
+        self.plot_tabs.currentChanged.connect(self.on_plot_tab_changed)
 
         """
         Event Connectors
@@ -535,9 +2395,23 @@ class SignalAnalyzer(QMainWindow):
         self.canvas.mpl_connect('button_press_event', self.on_click)
         self.canvas.mpl_connect('motion_notify_event', self.on_motion)
         self.canvas.mpl_connect('button_release_event', self.on_release)
-        self.fft_canvas.mpl_connect('button_press_event', self.on_fft_click)
-        self.fft_canvas.mpl_connect('motion_notify_event', self.on_fft_motion)
-        self.fft_canvas.mpl_connect('button_release_event', self.on_fft_release)
+        self.canvas.mpl_connect('resize_event', lambda event: self.redecimate())
+        self.downsampling_mode.currentTextChanged.connect(self.on_downsampling_changed)
+        self.renderer.currentTextChanged.connect(self.on_renderer_changed)
+        # Parameter edits recompute the shown results once the edits settle
+        self.watch_parameters('filter', [self.sampling_rate_input, self.filter_type, self.filter_order],
+                              self.reapply_filter)
+        self.watch_parameters('fft', [self.fft_sampling_rate, self.spectrum_method, self.welch_segment_input,
+                                      self.welch_overlap_input, self.welch_average,
+                                      self.window_type, self.kaiser_beta_input,
+                                      self.zero_padding, self.custom_padding_input, self.smoothing_type,
+                                      self.smoothing_window_input, self.freq_min, self.freq_max,
+                                      self.y_scale, self.fft_normalization],
+                              lambda: self.mark_stale(cwt=False))
+        self.watch_parameters('cwt', [self.wavelet_type, self.scales_min, self.scales_max, self.num_scales,
+                                      self.cwt_min, self.cwt_max, self.cwt_sampling_rate, self.colormap,
+                                      self.cwt_view_mode],
+                              lambda: self.mark_stale(fft=False))
 
         """
         Initialize filter parameters
@@ -545,6 +2419,69 @@ class SignalAnalyzer(QMainWindow):
         self.update_filter_parameters()
         self.update_fft_ui()
 
+    def build_fft_tab(self):
+        """Create the FFT figure, canvas and toolbar the first time they are needed"""
+        if self.fft_canvas is not None:
+            return
+        self.fft_figure = Figure(figsize=(12, 8))
+        self.fft_canvas = FigureCanvas(self.fft_figure)
+        self.fft_canvas.setObjectName("fft_canvas")
+        self.fft_toolbar = NavigationToolbar(self.fft_canvas, self)
+        self.fft_tab.layout().addWidget(self.fft_toolbar)
+        self.fft_tab.layout().addWidget(self.fft_canvas)
+        self.fft_canvas.mpl_connect('button_press_event', self.on_fft_click)
+        self.fft_canvas.mpl_connect('motion_notify_event', self.on_fft_motion)
+        self.fft_canvas.mpl_connect('button_release_event', self.on_fft_release)
+        self.fft_canvas.mpl_connect('resize_event', lambda event: self.redecimate_fft())
+
+    def build_cwt_tab(self):
+        """Create the CWT figure, canvas and toolbar the first time they are needed"""
+        if self.cwt_canvas is not None:
+            return
+        self.cwt_figure = Figure(figsize=(12, 8))
+        self.cwt_canvas = FigureCanvas(self.cwt_figure)
+        self.cwt_canvas.setObjectName("cwt_canvas")
+        self.cwt_toolbar = NavigationToolbar(self.cwt_canvas, self)
+        self.cwt_tab.layout().addWidget(self.cwt_toolbar)
+        self.cwt_tab.layout().addWidget(self.cwt_canvas)
+        self.cwt_canvas.mpl_connect('resize_event', lambda event: self.redecimate_cwt())
+
+    def on_plot_tab_changed(self, index):
+        """Build a tab on first view and recompute it if its data changed while hidden"""
+        tab = self.plot_tabs.widget(index)
+        if tab is self.fft_tab:
+            self.build_fft_tab()
+            if self.fft_stale:
+                self.calculate_fft()
+        elif tab is self.cwt_tab:
+            self.build_cwt_tab()
+            if self.cwt_stale:
+                self.calculate_cwt()
+
+    def mark_stale(self, fft=True, cwt=True):
+        """
+        Flag the FFT and/or CWT results as outdated after the signals or their parameters changed.
+        Only the visible tab is recomputed, the others wait until they are shown.
+        """
+        self.fft_stale = self.fft_stale or (fft and bool(self.fft_lines))
+        self.cwt_stale = self.cwt_stale or (cwt and bool(self.cwt_images))
+        current = self.plot_tabs.currentWidget()
+        if current is self.fft_tab and self.fft_stale:
+            self.calculate_fft()
+        elif current is self.cwt_tab and self.cwt_stale:
+            self.calculate_cwt()
+
+    def watch_parameters(self, name, widgets, callback):
+        """Debounce edits of the `widgets` parameters into one call of `callback`"""
+        for widget in widgets:
+            changed = widget.textChanged if isinstance(widget, QLineEdit) else widget.currentTextChanged
+            changed.connect(lambda *args: self.scheduler.debounce(name, callback))
+
+    def reapply_filter(self):
+        """Filter again with the edited parameters when a filter is applied"""
+        if self.is_filtered:
+            self.apply_filter()
+
     def update_fft_ui(self):
         """Update FFT UI based on selected options"""
         # Show/hide Kaiser beta parameter
@@ -552,8 +2489,18 @@ class SignalAnalyzer(QMainWindow):
         self.kaiser_beta_label.setVisible(show_kaiser)
         self.kaiser_beta_input.setVisible(show_kaiser)
 
+        # Welch parameters replace zero padding and normalization
+        welch = self.spectrum_method.currentText() == "Welch PSD"
+        for widget in (self.welch_segment_label, self.welch_segment_input, self.welch_segment_unit,
+                       self.welch_overlap_label, self.welch_overlap_input, self.welch_overlap_unit,
+                       self.welch_average_label, self.welch_average):
+            widget.setVisible(welch)
+        for widget in (self.zero_padding_label, self.zero_padding,
+                       self.fft_normalization_label, self.fft_normalization):
+            widget.setVisible(not welch)
+
         # Show/hide custom padding parameter
-        show_custom_padding = self.zero_padding.currentText() == "Custom"
+        show_custom_padding = not welch and self.zero_padding.currentText() == "Custom"
         self.custom_padding_label.setVisible(show_custom_padding)
         self.custom_padding_input.setVisible(show_custom_padding)
 
@@ -573,26 +2520,178 @@ class SignalAnalyzer(QMainWindow):
 
     def load_csv(self):
         """
-        Seek and open a CSV file
+        Seek and open a CSV file, parsing it in the background.
+        Parquet, Feather/Arrow and HDF5 files are opened with their native readers.
         :return: .csv File
         """
-        file_path, _ = QFileDialog.getOpenFileName(self, 'Open CSV File', '', 'CSV Files (*.csv)')
+        if self.load_thread is not None:
+            return
+        file_path, _ = QFileDialog.getOpenFileName(self, 'Open Signal File', '', SIGNAL_FILE_FILTER)
         if file_path:
-            try:
-                self.df = pd.read_csv(file_path)
-                self.df_normalized = None  # Resetear datos normalizados
-                self.is_normalized = False
-                self.show_data(self.df.head(20))
-                self.update_column_selectors()
-                self.signal_colors = {}
-                total_rows = sum(1 for _ in open(file_path)) - 1
-                info_text = f"📊 File: {file_path.split('/')[-1]}\n"
-                info_text += f"📈 Rows: {total_rows:,}, Columns: {len(self.df.columns)}\n"
-                info_text += f"👀 Showing: {min(20, total_rows)} preview"
-                self.file_info_label.setText(info_text)
-            except Exception as e:
-                error_label = QLabel(f"Error: {str(e)}")
-                self.bottom_layout.addWidget(error_label)
+            self.loading_file_path = file_path
+            if columnar_format(file_path):
+                self.open_columnar(file_path)
+                return
+            index = load_index(file_path)
+            if self.lazy_load_check.isChecked():
+                self.open_lazy(file_path, index)
+                return
+            if index is not None:
+                arrays = load_column_cache(file_path, float_dtype=np.dtype(self.channel_dtype.currentText()))
+                if arrays is not None:
+                    # Previously loaded file: memory-map the binary cache, no parsing
+                    dataset = SignalDataset(index['columns'], index['rows'], arrays,
+                                            CsvColumnLoader(file_path, CSV_ENGINES[self.csv_engine.currentText()],
+                                                            np.dtype(self.channel_dtype.currentText())))
+                    dataset.pyramids.update(load_pyramid_cache(file_path))
+                    self.show_data(dataset.head(20))
+                    self.on_load_finished(dataset, index)
+                    return
+            self.load_thread = QThread(self)
+            self.load_worker = CsvLoadWorker(file_path, CSV_ENGINES[self.csv_engine.currentText()],
+                                             np.dtype(self.channel_dtype.currentText()))
+            self.load_worker.moveToThread(self.load_thread)
+            self.load_thread.started.connect(self.load_worker.run)
+            self.load_worker.preview_ready.connect(self.on_load_preview)
+            self.load_worker.progress.connect(self.on_load_progress)
+            self.load_worker.loaded.connect(self.on_load_finished)
+            self.load_worker.failed.connect(self.on_load_failed)
+            self.load_worker.loaded.connect(self.load_thread.quit)
+            self.load_worker.failed.connect(self.load_thread.quit)
+            self.load_thread.finished.connect(self.on_load_thread_finished)
+            self.load_btn.setEnabled(False)
+            if index is not None:
+                # Known file: show its stats right away while it is parsed
+                self.show_file_info(file_path, index['columns'], index['rows'], index, loading=True)
+            else:
+                self.file_info_label.setText(f"⏳ Loading: {file_path.split('/')[-1]}")
+            self.load_thread.start()
+
+    def open_lazy(self, file_path, index):
+        """
+        Open a CSV file reading only its header, channels are loaded when
+        they are first checked or used
+        """
+        try:
+            preview = pd.read_csv(file_path, nrows=20)
+        except Exception as e:
+            self.on_load_failed(str(e))
+            return
+        dataset = SignalDataset(preview.columns, index['rows'] if index else None,
+                                loader=CsvColumnLoader(file_path, CSV_ENGINES[self.csv_engine.currentText()],
+                                                       np.dtype(self.channel_dtype.currentText())),
+                                preview=preview)
+        self.show_data(preview)
+        self.on_load_finished(dataset, index)
+
+    def open_columnar(self, file_path):
+        """
+        Open a Parquet, Feather/Arrow or HDF5 file. Columns are read with
+        projection, so in lazy mode only the checked channels are ever decoded.
+        """
+        try:
+            columns, n_rows = read_columnar_schema(file_path)
+            preview = pd.DataFrame(read_columnar(file_path, start=0, stop=20))
+            dataset = SignalDataset(columns, n_rows, loader=ColumnarLoader(file_path), preview=preview)
+            if not self.lazy_load_check.isChecked():
+                dataset.load(columns)
+        except Exception as e:
+            self.on_load_failed(str(e))
+            return
+        self.show_data(preview)
+        self.on_load_finished(dataset, None)
+
+    def export_data(self):
+        """Save the current (filtered / normalized / raw) data in a columnar format"""
+        if self.df is None:
+            return
+        file_path, selected_filter = QFileDialog.getSaveFileName(self, 'Export Data', '', EXPORT_FILE_FILTER)
+        if not file_path:
+            return
+        if columnar_format(file_path) is None:
+            if selected_filter.startswith('HDF5'):
+                file_path += '.h5'
+            elif selected_filter.startswith('Feather'):
+                file_path += '.feather'
+            else:
+                file_path += '.parquet'
+        if self.is_filtered and self.df_filtered is not None:
+            data = self.df_filtered
+        elif self.is_normalized and self.df_normalized is not None:
+            data = self.df_normalized
+        else:
+            data = self.df
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            write_columnar(file_path, data)
+            self.file_info_label.setText(f"💾 Exported: {file_path.split('/')[-1]}")
+        except Exception as e:
+            self.file_info_label.setText(f"Error: {e}")
+        finally:
+            QApplication.restoreOverrideCursor()
+
+    def on_load_preview(self, preview):
+        """Fill the preview table from the first parsed block"""
+        self.show_data(preview)
+
+    def on_load_progress(self, bytes_read, total_bytes, n_rows):
+        percent = 100.0 * bytes_read / total_bytes if total_bytes else 100.0
+        info_text = f"⏳ Loading: {self.loading_file_path.split('/')[-1]}\n"
+        info_text += f"📈 {percent:.0f}% - Rows parsed: {n_rows:,}"
+        self.file_info_label.setText(info_text)
+
+    def on_load_finished(self, dataset, index):
+        file_path = self.loading_file_path
+        self.df = dataset
+        self.df_normalized = None  # Resetear datos normalizados
+        self.is_normalized = False
+        self.df_filtered = None
+        self.is_filtered = False
+        self.signal_colors = {}
+        self.spectrum_cache.clear()
+        self.update_column_selectors()
+        self.file_summary = (file_path, index)
+        self.show_file_info(file_path, dataset.columns, dataset.n_rows, index)
+        self.mark_stale()
+
+    def show_file_info(self, file_path, columns, total_rows, index=None, loading=False):
+        """
+        Show the file summary, with sample rate and stats from its sidecar index
+        :param total_rows: row count, None if not known yet (lazy CSV load)
+        :param loading: the file is still being parsed
+        """
+        info_text = f"{'⏳' if loading else '📊'} File: {file_path.split('/')[-1]}\n"
+        if total_rows is None:
+            info_text += f"📈 Rows: not counted yet, Columns: {len(columns)}"
+        else:
+            info_text += f"📈 Rows: {total_rows:,}, Columns: {len(columns)}"
+        if index is not None and index.get('sample_rate'):
+            info_text += f", Fs: {index['sample_rate']:,.0f} Hz"
+        info_text += f"\n👀 Showing: {min(20, total_rows or 20)} preview"
+        self.file_info_label.setText(info_text)
+        if index is None:
+            self.file_info_label.setToolTip("")
+            return
+        self.file_info_label.setToolTip("\n".join(
+            f"{column}: min {stats['min']:.6g}, max {stats['max']:.6g}, mean {stats['mean']:.6g}"
+            for column, stats in index['stats'].items()))
+
+    def on_load_failed(self, message):
+        self.file_info_label.setText(f"Error: {message}")
+
+    def on_load_thread_finished(self):
+        self.load_worker.deleteLater()
+        self.load_thread.deleteLater()
+        self.load_worker = None
+        self.load_thread = None
+        self.load_btn.setEnabled(True)
+
+    def closeEvent(self, event):
+        if self.load_thread is not None:
+            self.load_worker.cancel()
+            self.load_thread.quit()
+            self.load_thread.wait()
+        super().closeEvent(event)
 
     def show_data(self, df):
         """
@@ -634,20 +2733,79 @@ class SignalAnalyzer(QMainWindow):
                         item.setForeground(QColor('white'))
                     self.y_columns_list.addItem(item)
 
+    def on_y_item_changed(self, item):
+        """Load a lazily opened channel as soon as it is checked"""
+        if self.df is None or item.checkState() != Qt.CheckState.Checked:
+            self.mark_stale()
+            return
+        column = item.text()
+        if self.df.is_loaded(column):
+            self.mark_stale()
+            return
+        rows_counted = self.df.n_rows is not None
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            self.df.load([name for name in (self.x_axis_combo.currentText(), column) if name])
+        except Exception as e:
+            print(f"Error loading column {column}: {e}")
+        finally:
+            QApplication.restoreOverrideCursor()
+        if not rows_counted and self.df.n_rows is not None:
+            # The first loaded column counted the rows of a lazily opened file
+            file_path, index = self.file_summary
+            self.show_file_info(file_path, self.df.columns, self.df.n_rows, index)
+        self.release_unused_columns()
+        self.mark_stale()
+
+    def release_unused_columns(self):
+        """Free columns that are not checked when the memory budget is exceeded"""
+        try:
+            budget = float(self.memory_budget_input.text()) * 1024 * 1024
+        except ValueError:
+            budget = LAZY_MEMORY_BUDGET_MB * 1024 * 1024
+        keep = {self.x_axis_combo.currentText()}
+        for i in range(self.y_columns_list.count()):
+            item = self.y_columns_list.item(i)
+            if item.checkState() == Qt.CheckState.Checked:
+                keep.add(item.text())
+        self.df.trim(keep, budget)
+
+    def get_x_range(self):
+        """:return: (x_min, x_max) from the range inputs, None for empty or invalid fields"""
+        limits = []
+        for field in (self.x_min_input, self.x_max_input):
+            try:
+                limits.append(float(field.text().strip()))
+            except ValueError:
+                limits.append(None)
+        return tuple(limits)
+
     def plot_signals(self):
         if self.df is None or self.y_columns_list.count() == 0:
             return
         try:
-            self.figure.clear()
             self.clear_plot_elements()
-            self.ax = self.figure.add_subplot(111)
+            if self.ax not in self.figure.axes:
+                # Axes and lines are created once and then updated in place
+                self.figure.clear()
+                self.ax = self.figure.add_subplot(111)
+                self.ax.callbacks.connect('xlim_changed', lambda ax: self.redecimate())
+                self.signal_lines = {}
+                self.layout_keys.pop('signal', None)
             x_column = self.x_axis_combo.currentText()
             selected_y_columns = []
             for i in range(self.y_columns_list.count()):
                 item = self.y_columns_list.item(i)
                 if item.checkState() == Qt.CheckState.Checked:
                     selected_y_columns.append(item.text())
+            for y_column in [name for name in self.signal_lines if name not in selected_y_columns]:
+                self.signal_lines.pop(y_column).remove()
             if not selected_y_columns:
+                self.plotted_lines = []
+                self.pick_indexes = {}
+                if self.fast_view is not None:
+                    self.fast_view.set_lines({})
+                self.scheduler.draw(self.canvas)
                 return
 
             if self.is_filtered and self.df_filtered is not None:
@@ -660,34 +2818,41 @@ class SignalAnalyzer(QMainWindow):
                 plot_data = self.df
                 y_label = self.y_label_input.text()
 
-            x_min = self.x_min_input.text().strip()
-            x_max = self.x_max_input.text().strip()
-            plot_data = plot_data.copy()
-            if x_min:
-                try:
-                    x_min_val = float(x_min)
-                    plot_data = plot_data[plot_data[x_column] >= x_min_val]
-                except ValueError:
-                    pass
-            if x_max:
-                try:
-                    x_max_val = float(x_max)
-                    plot_data = plot_data[plot_data[x_column] <= x_max_val]
-                except ValueError:
-                    pass
+            x_min_val, x_max_val = self.get_x_range()
+            rows = plot_data.rows_in_range(x_column, x_min_val, x_max_val)
+            self.plot_source = (plot_data, x_column, rows)
 
             colors = plt.cm.tab10(np.linspace(0, 1, len(selected_y_columns)))
+            self.line_colors = {y_column: self.signal_colors.get(y_column, colors[i])
+                                for i, y_column in enumerate(selected_y_columns)}
+            x_source = plot_data.timebase(x_column)
+            x_source = plot_data[x_column] if x_source is None else x_source
+            self.pick_indexes = {y_column: LinePickIndex(x_source, plot_data[y_column], rows)
+                                 for y_column in selected_y_columns}
             self.plotted_lines = []
             legend_handles = []
 
-            for i, y_column in enumerate(selected_y_columns):
-                color = self.signal_colors.get(y_column, colors[i])
-                line, = self.ax.plot(plot_data[x_column], plot_data[y_column],
-                                     label=y_column, color=color,
-                                     linewidth=float(self.line_input.text()),
-                                     alpha=0.8)
+            if self.fast_view_active():
+                self.plot_signals_fast(rows, y_label)
+                return
+
+            x_lo, x_hi, width = self.signal_view()
+            self.decimated_view = self.view_key(rows, x_lo, x_hi, width)
+            # Lines are only handed to redecimate() once the view has been rescaled to them
+            plotted_lines = []
+            for y_column, color in self.line_colors.items():
+                line = self.signal_lines.get(y_column)
+                if line is None:
+                    line, = self.ax.plot([], [], label=y_column, alpha=0.8)
+                    self.signal_lines[y_column] = line
+                line.set_data(*self.decimated_line_data(y_column, rows, width))
+                line.set_color(color)
+                line.set_linewidth(float(self.line_input.text()))
                 legend_handles.append(line)
-                self.plotted_lines.append((line, y_column))
+                plotted_lines.append((line, y_column))
+            self.ax.relim()
+            self.ax.autoscale()
+            self.plotted_lines = plotted_lines
 
             # Set titles and labels
             title = self.title_input.text()
@@ -696,33 +2861,170 @@ class SignalAnalyzer(QMainWindow):
 
             x_label = self.x_label_input.text()
 
-            self.ax.set_xlabel(x_label, fontsize=20)
-            self.ax.set_ylabel(y_label, fontsize=20)
-            self.ax.set_title(title, fontsize=16, fontweight='bold')
-            self.ax.grid(False)
-            self.ax.legend(handles=legend_handles, loc='best', framealpha=0.9, fontsize=18)
-            self.figure.tight_layout()
-            self.canvas.draw_idle()
+            # Labels, legend and layout are only redone when they change
+            layout_key = (x_label, y_label, title, tuple(selected_y_columns),
+                          tuple(str(line.get_color()) for line in legend_handles))
+            if self.layout_keys.get('signal') != layout_key:
+                self.layout_keys['signal'] = layout_key
+                self.ax.set_xlabel(x_label, fontsize=20)
+                self.ax.set_ylabel(y_label, fontsize=20)
+                self.ax.set_title(title, fontsize=16, fontweight='bold')
+                self.ax.grid(False)
+                self.ax.legend(handles=legend_handles, loc='best', framealpha=0.9, fontsize=18)
+                self.figure.tight_layout()
+            self.scheduler.draw(self.canvas)
 
         except Exception as e:
             print(f"Error in plotting: {e}")
 
+    def plot_signals_fast(self, rows, y_label):
+        """plot_signals for the pyqtgraph renderer"""
+        width = float(self.line_input.text())
+        self.fast_view.set_lines({y_column: (color, width) for y_column, color in self.line_colors.items()})
+        self.fast_view.set_labels(self.title_input.text(), self.x_label_input.text(), y_label)
+        pixels = max(self.fast_view.pixel_width(), 1)
+        for y_column in self.line_colors:
+            self.fast_view.set_line_data(y_column, *self.decimated_line_data(y_column, rows, pixels))
+            self.plotted_lines.append((self.fast_view.lines[y_column], y_column))
+        self.decimated_view = None
+        self.fast_view.auto_range()
+
+    def fast_view_active(self):
+        return self.fast_view is not None and self.signal_stack.currentWidget() is self.fast_view
+
+    def on_renderer_changed(self, renderer):
+        """Switch the Signal tab between matplotlib and the pyqtgraph view"""
+        if renderer == 'pyqtgraph (fast)' and self.fast_view is None:
+            try:
+                self.fast_view = FastSignalView()
+            except ImportError as e:
+                print(f"Error loading the fast renderer: {e}")
+                self.renderer.setCurrentText('matplotlib')
+                return
+            self.fast_view.range_changed.connect(self.redecimate)
+            self.fast_view.clicked.connect(self.on_fast_click)
+            self.signal_stack.addWidget(self.fast_view)
+        self.clear_plot_elements()
+        self.plotted_lines = []
+        self.signal_stack.setCurrentIndex(SIGNAL_RENDERERS.index(renderer))
+        self.plot_signals()
+
+    def signal_view(self):
+        """:return: (x_lo, x_hi, width in pixels) of the active Signal tab view"""
+        if self.fast_view_active():
+            (x_lo, x_hi), width = self.fast_view.x_range(), self.fast_view.pixel_width()
+        else:
+            (x_lo, x_hi), width = sorted(self.ax.get_xlim()), self.ax.bbox.width
+        return x_lo, x_hi, max(int(width), 1)
+
+    def decimated_line_data(self, y_column, rows, width):
+        """
+        X/Y data of a plotted channel over `rows`, reduced to about
+        DECIMATION_POINTS_PER_PIXEL points per horizontal pixel of a view
+        `width` pixels wide with the selected downsampling mode
+        """
+        plot_data, x_column, _ = self.plot_source
+        mode = self.downsampling_mode.currentText()
+        if mode == "None":
+            return plot_data.column_rows(x_column, rows), plot_data.column_rows(y_column, rows)
+        n_points = width * DECIMATION_POINTS_PER_PIXEL
+        n_bins = n_points * (LTTB_PRESELECT if mode == "LTTB" else 1) // 2
+        picks = None
+        if isinstance(rows, slice):
+            # Long ranges are served from the precomputed pyramid in time proportional to n_bins
+            picks = plot_data.pyramid(y_column).decimate(plot_data[y_column], rows.start, rows.stop, n_bins)
+        if picks is None:
+            local = minmax_decimate(plot_data.column_rows(y_column, rows), n_bins)
+            picks = local + rows.start if isinstance(rows, slice) else np.flatnonzero(rows)[local]
+        x_values, y_values = plot_data.column_rows(x_column, picks), plot_data.column_rows(y_column, picks)
+        if mode == "LTTB":
+            # LTTB on the min/max preselection, so its cost depends on the screen width only
+            keep = lttb_indices(x_values, y_values, n_points)
+            return x_values[keep], y_values[keep]
+        return x_values, y_values
+
+    def visible_rows(self, x_lo, x_hi):
+        """Rows of the plotted range that fall inside the visible X range"""
+        plot_data, x_column, rows = self.plot_source
+        visible = plot_data.rows_in_range(x_column, x_lo, x_hi)
+        if isinstance(visible, slice):
+            # One extra sample on each side so the lines run to the axes edges
+            start = max(visible.start - 1, rows.start)
+            stop = min(visible.stop + 1, rows.stop)
+            return slice(start, max(stop, start))
+        return visible & rows
+
+    def view_key(self, rows, x_lo, x_hi, width):
+        """Identifies a decimated view so unchanged ranges are not redone"""
+        if isinstance(rows, slice):
+            return rows.start, rows.stop, width
+        return x_lo, x_hi, width
+
+    def on_downsampling_changed(self):
+        self.decimated_view = None
+        self.redecimate()
+        self.redecimate_fft()
+
+    def redecimate_fft(self):
+        """Downsample the FFT lines from their full spectra for the visible frequency range"""
+        if not self.fft_spectra:
+            return
+        try:
+            mode = self.downsampling_mode.currentText()
+            n_points = max(int(self.fft_ax.bbox.width), 1) * DECIMATION_POINTS_PER_PIXEL
+            f_lo, f_hi = sorted(self.fft_ax.get_xlim())
+            for line, (xf, yf) in self.fft_spectra.items():
+                start, stop = np.searchsorted(xf, f_lo), np.searchsorted(xf, f_hi, side='right')
+                visible = slice(max(start - 1, 0), min(stop + 1, len(xf)))
+                keep = downsample_indices(xf[visible], yf[visible], n_points, mode)
+                line.set_data(xf[visible][keep], yf[visible][keep])
+            self.scheduler.draw(self.fft_canvas)
+        except Exception as e:
+            print(f"Error decimating FFT: {e}")
+
+    def redecimate(self):
+        """Re-decimate the plotted lines from full-resolution data after a zoom, pan or resize"""
+        if self.plot_source is None or not self.plotted_lines:
+            return
+        try:
+            x_lo, x_hi, width = self.signal_view()
+            rows = self.visible_rows(x_lo, x_hi)
+            key = self.view_key(rows, x_lo, x_hi, width)
+            if key == self.decimated_view:
+                return
+            self.decimated_view = key
+            if self.fast_view_active():
+                for line, column_name in self.plotted_lines:
+                    self.fast_view.set_line_data(column_name, *self.decimated_line_data(column_name, rows, width))
+                return
+            for line, column_name in self.plotted_lines:
+                line.set_data(*self.decimated_line_data(column_name, rows, width))
+            self.scheduler.draw(self.canvas)
+        except Exception as e:
+            print(f"Error decimating signals: {e}")
+
     def toggle_legend(self):
-        if hasattr(self, 'ax') and self.ax.get_legend():
+        if self.fast_view_active():
+            self.fast_view.toggle_legend()
+        elif self.ax is not None and self.ax.get_legend():
             legend = self.ax.get_legend()
             legend.set_visible(not legend.get_visible())
-            self.canvas.draw_idle()
+            self.scheduler.draw(self.canvas)
 
     def clear_plot(self):
+        if self.fast_view is not None:
+            self.fast_view.set_lines({})
         self.figure.clear()
         self.clear_plot_elements()
         self.plotted_lines = []
-        self.canvas.draw_idle()
+        self.pick_indexes = {}
+        self.plot_source = None
+        self.scheduler.draw(self.canvas)
 
     def on_click(self, event):
         if event.button == 3:
             self.clear_plot_elements()
-            self.canvas.draw_idle()
+            self.scheduler.draw(self.canvas)
             return
 
         if event.inaxes != self.ax or event.button != 1:
@@ -736,6 +3038,7 @@ class SignalAnalyzer(QMainWindow):
                 self.dragging_annotation = annotation
                 x_ann, y_ann = annotation.get_position()
                 self.drag_offset = (event.xdata - x_ann, event.ydata - y_ann)
+                self.drag_blitter = BlitDragger(self.canvas, [annotation])
                 return
 
         x_click = event.xdata
@@ -743,31 +3046,16 @@ class SignalAnalyzer(QMainWindow):
         if x_click is None or y_click is None:
             return
 
-        min_dist = float('inf')
-        closest_point = None
-        closest_line = None
+        # X range of the pick radius around the click, and data -> pixel mapping
+        pick_range = self.ax.transData.inverted().transform(
+            [(event.x - PICK_RADIUS_PIXELS, event.y), (event.x + PICK_RADIUS_PIXELS, event.y)])[:, 0]
+        closest = self.pick_sample(*sorted(pick_range),
+                                   lambda x, y: self.ax.transData.transform(np.column_stack([x, y])).T,
+                                   (event.x, event.y))
+        if closest:
+            x_real, y_real, column_name = closest
 
-        try:
-            distance_value = float(self.distance_input.text())
-        except ValueError:
-            distance_value = 1.0
-
-        for line, column_name in self.plotted_lines:
-            x_values = line.get_xdata()
-            y_values = line.get_ydata()
-
-            idx = np.abs(x_values - x_click).argmin()
-            dist = np.hypot(x_click - x_values[idx], y_click - y_values[idx])
-
-            if dist < min_dist:
-                min_dist = dist
-                closest_point = (x_values[idx], y_values[idx])
-                closest_line = line
-
-        if closest_point:
-            x_real, y_real = closest_point
-
-            marker_color = closest_line.get_color()
+            marker_color = self.line_colors[column_name]
 
             marker, = self.ax.plot(x_real, y_real, marker='o', color=marker_color,
                                    markersize=10, zorder=5, alpha=0.8)
@@ -779,13 +3067,7 @@ class SignalAnalyzer(QMainWindow):
                 linea, = self.ax.plot([x1, x2], [y1, y2], 'k-', linewidth=2, zorder=4, alpha=0.7)
                 self.delta_lines.append(linea)
 
-                dx = x2 - x1
-                dy = y2 - y1
-
-                texto = (f"P1: (t={x1:.6f} s)\n"
-                         f"P2: (t={x2:.6f} s)\n"
-                         f"Δt = {dx:.6f} s\n"
-                         f"v = {np.abs(distance_value / dx):.6f} m/s")
+                texto = self.measurement_text(x1, x2)
 
                 y_pos = 0.95 - len(self.annotations) * 0.12
 
@@ -804,7 +3086,54 @@ class SignalAnalyzer(QMainWindow):
                 self.annotations.append(anotacion)
                 self.selected_points = []
 
-            self.canvas.draw_idle()
+            self.scheduler.draw(self.canvas)
+
+    def pick_sample(self, x_lo, x_hi, to_display, click):
+        """
+        Sample of the plotted channels closest to a click in display pixels,
+        picked from the full-resolution data, not the decimated lines
+        :param x_lo, x_hi: X range of the pick radius around the click
+        :return: (x, y, column name), or None
+        """
+        min_dist = float('inf')
+        closest = None
+        for column_name, pick_index in self.pick_indexes.items():
+            picked = pick_index.nearest(x_lo, x_hi, to_display, click)
+            if picked is not None and picked[0] < min_dist:
+                min_dist = picked[0]
+                closest = (picked[1], picked[2], column_name)
+        return closest
+
+    def measurement_text(self, x1, x2):
+        """Δt between two picked points and the velocity over the set distance"""
+        try:
+            distance_value = float(self.distance_input.text())
+        except ValueError:
+            distance_value = 1.0
+        dx = x2 - x1
+        return (f"P1: (t={x1:.6f} s)\n"
+                f"P2: (t={x2:.6f} s)\n"
+                f"Δt = {dx:.6f} s\n"
+                f"v = {np.abs(distance_value / dx):.6f} m/s")
+
+    def on_fast_click(self, x_click, y_click, button):
+        """on_click for the pyqtgraph renderer: pick points and measure Δt/velocity"""
+        if button == 3:
+            self.clear_plot_elements()
+            return
+        closest = self.pick_sample(*self.fast_view.pick_range(x_click, PICK_RADIUS_PIXELS),
+                                   self.fast_view.to_display,
+                                   self.fast_view.to_display(x_click, y_click))
+        if closest is None:
+            return
+        x_real, y_real, column_name = closest
+        self.fast_view.add_marker(x_real, y_real, self.line_colors[column_name])
+        self.selected_points.append((x_real, y_real))
+        if len(self.selected_points) == 2:
+            (x1, y1), (x2, y2) = self.selected_points
+            self.fast_view.add_segment(x1, y1, x2, y2)
+            self.fast_view.add_text(self.measurement_text(x1, x2), (x1 + x2) / 2, (y1 + y2) / 2)
+            self.selected_points = []
 
     def on_motion(self, event):
         if self.dragging_annotation is None or event.inaxes != self.ax or event.xdata is None or event.ydata is None:
@@ -814,9 +3143,12 @@ class SignalAnalyzer(QMainWindow):
         new_y = event.ydata - self.drag_offset[1]
 
         self.dragging_annotation.set_position((new_x, new_y))
-        self.canvas.draw_idle()
+        self.drag_blitter.update()
 
     def on_release(self, event):
+        if self.drag_blitter is not None:
+            self.drag_blitter.finish()
+            self.drag_blitter = None
         self.dragging_annotation = None
         self.drag_offset = (0, 0)
 
@@ -842,6 +3174,8 @@ class SignalAnalyzer(QMainWindow):
         self.delta_lines.clear()
         self.selected_points.clear()
         self.dragging_annotation = None
+        if self.fast_view is not None:
+            self.fast_view.clear_overlay()
 
     def normalized_signal(self):
         if self.df is None or self.y_columns_list.count() == 0:
@@ -855,20 +3189,18 @@ class SignalAnalyzer(QMainWindow):
 
             if not selected_y_columns:
                 return
-            self.df_normalized = self.df.copy()
+            self.df_normalized = self.df.derive()
             x_column = self.x_axis_combo.currentText()
-            for column in selected_y_columns:
-                if column != x_column:
-                    data = self.df_normalized[column]
-                    max_val = data.max()
-                    min_val = data.min()
-                    range_val = max_val - min_val
-                    if range_val != 0:
-                        self.df_normalized[column] = 2 * ((data - min_val) / range_val) - 1
-                    else:
-                        self.df_normalized[column] = 0
+            columns = [column for column in selected_y_columns if column != x_column]
+            # Normalize all channels at once along the sample axis
+            data = self.df.matrix(columns)
+            min_val = data.min(axis=1, keepdims=True)
+            range_val = data.max(axis=1, keepdims=True) - min_val
+            scaled = np.divide(data - min_val, range_val, out=np.full(data.shape, 0.5), where=range_val != 0)
+            self.df_normalized.assign(columns, 2 * scaled - 1)
             self.is_normalized = True
             self.plot_signals()
+            self.mark_stale()
         except Exception as e:
             print(f"Error normalizing signals: {e}")
 
@@ -908,6 +3240,7 @@ class SignalAnalyzer(QMainWindow):
         self.filter_params_layout.addWidget(label, row, 0)
         self.filter_params_layout.addWidget(input_field, row, 1)
         self.filter_params_layout.addWidget(unit_label, row, 2)
+        self.watch_parameters('filter', [input_field], self.reapply_filter)
 
     def apply_filter(self):
         """Apply selected filter to signals"""
@@ -924,7 +3257,7 @@ class SignalAnalyzer(QMainWindow):
                 data_to_filter = self.df_normalized
             else:
                 data_to_filter = self.df
-            self.df_filtered = data_to_filter.copy()
+            self.df_filtered = data_to_filter.derive()
             x_column = self.x_axis_combo.currentText()
             selected_y_columns = []
             for i in range(self.y_columns_list.count()):
@@ -933,20 +3266,20 @@ class SignalAnalyzer(QMainWindow):
                     selected_y_columns.append(item.text())
             if not selected_y_columns:
                 return
-            for column in selected_y_columns:
-                if column != x_column:
-                    signal_data = data_to_filter[column].values
-                    filtered_data = self.apply_specific_filter(signal_data, filter_type, order)
-                    if filtered_data is not None:
-                        self.df_filtered[column] = filtered_data
+            columns = [column for column in selected_y_columns if column != x_column]
+            # Filter all channels in one call along the sample axis
+            filtered_data = self.apply_specific_filter(data_to_filter.matrix(columns), filter_type, order)
+            if filtered_data is not None:
+                self.df_filtered.assign(columns, filtered_data)
             self.is_filtered = True
             self.plot_signals()
+            self.mark_stale()
 
         except Exception as e:
             print(f"Error applying filter: {e}")
 
     def apply_specific_filter(self, signal_data, filter_type, order):
-        """Apply specific filter type to signal data"""
+        """Apply specific filter type to signal data (1D, or channels x samples along the last axis)"""
         try:
             nyquist = 0.5 * self.sampling_rate
 
@@ -1003,6 +3336,7 @@ class SignalAnalyzer(QMainWindow):
         self.is_filtered = False
         self.df_filtered = None
         self.plot_signals()
+        self.mark_stale()
 
     def calculate_fft(self):
         """
@@ -1012,12 +3346,20 @@ class SignalAnalyzer(QMainWindow):
             return
 
         try:
-            # Clear previous FFT plot
-            self.fft_figure.clear()
-            self.fft_ax = self.fft_figure.add_subplot(111)
-            self.fft_annotations.clear()
-            self.fft_markers.clear()
-            self.fft_selected_points.clear()
+            self.build_fft_tab()
+            self.fft_stale = False
+            # Clear previous selections, the axes and lines are reused
+            self.clear_fft_selections()
+            if self.fft_ax not in self.fft_figure.axes:
+                self.fft_figure.clear()
+                self.fft_ax = self.fft_figure.add_subplot(111)
+                self.fft_ax.callbacks.connect('xlim_changed', lambda ax: self.redecimate_fft())
+                self.fft_lines = {}
+                self.layout_keys.pop('fft', None)
+            # Spectra are only handed to redecimate_fft() once the view has been rescaled to them
+            self.fft_spectra = {}
+            self.fft_pick_indexes = {}
+            spectra = {}
 
             # Get selected signals
             selected_y_columns = []
@@ -1026,7 +3368,10 @@ class SignalAnalyzer(QMainWindow):
                 if item.checkState() == Qt.CheckState.Checked:
                     selected_y_columns.append(item.text())
 
+            for y_column in [name for name in self.fft_lines if name not in selected_y_columns]:
+                self.fft_lines.pop(y_column).remove()
             if not selected_y_columns:
+                self.scheduler.draw(self.fft_canvas)
                 return
 
             # Get data source
@@ -1038,7 +3383,8 @@ class SignalAnalyzer(QMainWindow):
                 data_source = self.df
 
             x_column = self.x_axis_combo.currentText()
-            time_data = data_source[x_column].values
+            x_min_val, x_max_val = self.get_x_range()
+            rows = data_source.rows_in_range(x_column, x_min_val, x_max_val)
 
             # Get FFT parameters
             sampling_rate = float(self.fft_sampling_rate.text())
@@ -1049,66 +3395,71 @@ class SignalAnalyzer(QMainWindow):
             freq_max = float(self.freq_max.text())
             y_scale = self.y_scale.currentText()
             normalization = self.fft_normalization.currentText()
-
-            # Calculate sampling rate from time data if available
-            if len(time_data) > 1:
-                actual_sampling_rate = 1.0 / (time_data[1] - time_data[0])
-            else:
-                actual_sampling_rate = sampling_rate
+            method = self.spectrum_method.currentText()
+
+            # Sampling rate from the time axis if available
+            actual_sampling_rate = data_source.sample_rate(x_column) or sampling_rate
+
+            welch_settings = None
+            if method == "Welch PSD":
+                n_rows = len(range(*rows.indices(len(data_source)))) if isinstance(rows, slice) else len(rows)
+                segment_text = self.welch_segment_input.text().strip()
+                if segment_text.lower() in ("", "auto"):
+                    # Depends on the X range only, so frequency range edits reuse the cached spectrum
+                    segment_length = next_fast_len(max(1, n_rows // WELCH_AUTO_SEGMENTS), real=True)
+                else:
+                    segment_length = int(segment_text)
+                segment_length = max(1, min(segment_length, n_rows))
+                overlap = float(self.welch_overlap_input.text())
+                average = self.welch_average.currentText()
+                median_bins = None
+                if average == "Median":
+                    step = max(1, segment_length - int(segment_length * overlap / 100))
+                    n_bins = segment_length // 2 + 1
+                    if (1 + (n_rows - segment_length) // step) * n_bins * 4 > WELCH_MEDIAN_MB * 1024 * 1024:
+                        # Too many segment powers to keep for every bin, keep only the bins shown
+                        median_bins = min(n_bins, int(freq_max * segment_length / actual_sampling_rate) + 1)
+                welch_settings = (segment_length, overlap, average, median_bins)
 
             colors = plt.cm.tab10(np.linspace(0, 1, len(selected_y_columns)))
             legend_handles = []
 
+            # Raw spectra are cached, so only channels or settings not seen before are transformed
+            beta = float(self.kaiser_beta_input.text()) if window_type == "Kaiser" else None
+            custom_padding = self.custom_padding_input.text() if zero_padding == "Custom" else None
+            spectrum_key = (data_source.version, x_column, x_min_val, x_max_val, window_type, beta,
+                            welch_settings or (zero_padding, custom_padding), actual_sampling_rate)
+            raw_spectra = {y_column: self.spectrum_cache.get((spectrum_key, y_column))
+                           for y_column in selected_y_columns}
+            missing = [y_column for y_column, entry in raw_spectra.items() if entry is None]
+            if missing and welch_settings is not None:
+                computed = self.compute_welch_spectra(data_source, missing, rows, window_type, beta,
+                                                      welch_settings, actual_sampling_rate)
+            elif missing:
+                computed = self.compute_raw_spectra(data_source, missing, rows, window_type, beta,
+                                                    zero_padding, actual_sampling_rate)
+            if missing:
+                for y_column, entry in zip(missing, computed):
+                    self.spectrum_cache.put((spectrum_key, y_column), entry)
+                    raw_spectra[y_column] = entry
+
             for i, y_column in enumerate(selected_y_columns):
-                signal_data = data_source[y_column].values
                 color = self.signal_colors.get(y_column, colors[i])
-
-                # Apply selected window
-                n = len(signal_data)
-                if window_type == "Hanning":
-                    window = np.hanning(n)
-                elif window_type == "Hamming":
-                    window = np.hamming(n)
-                elif window_type == "Blackman":
-                    window = np.blackman(n)
-                elif window_type == "Bartlett":
-                    window = np.bartlett(n)
-                elif window_type == "Kaiser":
-                    beta = float(self.kaiser_beta_input.text())
-                    window = np.kaiser(n, beta)
-                else:  # Rectangular
-                    window = np.ones(n)
-
-                windowed_signal = signal_data * window
-
-                # Apply zero padding if selected
-                if zero_padding == "None":
-                    n_fft = n
-                elif zero_padding == "2x":
-                    n_fft = 2 * n
-                elif zero_padding == "4x":
-                    n_fft = 4 * n
-                elif zero_padding == "8x":
-                    n_fft = 8 * n
-                elif zero_padding == "Custom":
-                    n_fft = int(self.custom_padding_input.text())
-
-                # Calculate FFT
-                yf = fft(windowed_signal, n=n_fft)
-                xf = fftfreq(n_fft, 1 / actual_sampling_rate)
-
-                # Take only positive frequencies
-                positive_freq_mask = (xf >= 0) & (xf <= freq_max)
+                xf, magnitude, n, coherent_gain, enbw = raw_spectra[y_column]
+                positive_freq_mask = xf <= freq_max
                 xf_positive = xf[positive_freq_mask]
-                yf_positive = np.abs(yf[positive_freq_mask])
+                yf_positive = magnitude[positive_freq_mask].astype(np.float64, copy=False)
 
-                # Apply normalization
-                if normalization == "Amplitude":
-                    yf_positive = 2.0 / n * yf_positive
+                # Apply normalization, corrected for the window's coherent gain and noise bandwidth
+                if welch_settings is not None:
+                    pass  # Welch spectra are already a PSD
+                elif normalization == "Amplitude":
+                    yf_positive = 2.0 / (n * coherent_gain) * yf_positive
                 elif normalization == "Power":
-                    yf_positive = (2.0 / n * yf_positive) ** 2
+                    yf_positive = (2.0 / (n * coherent_gain) * yf_positive) ** 2
                 elif normalization == "PSD":
-                    yf_positive = (2.0 / n * yf_positive) ** 2 / (actual_sampling_rate / n)
+                    # Mean square per Hz (half the squared amplitude), the same scaling as the Welch PSD
+                    yf_positive = (2.0 / (n * coherent_gain) * yf_positive) ** 2 / (2 * actual_sampling_rate / n * enbw)
 
                 # Apply smoothing if selected
                 if smoothing_type != "None":
@@ -1128,18 +3479,24 @@ class SignalAnalyzer(QMainWindow):
                 xf_filtered = xf_positive[freq_mask]
                 yf_filtered = yf_smoothed[freq_mask]
 
-                # Plot FFT
-                line, = self.fft_ax.plot(xf_filtered, yf_filtered,
-                                         label=y_column, color=color,
-                                         linewidth=float(self.line_input.text()),
-                                         alpha=0.8)
+                # Plot FFT, downsampled to the canvas width like the signal lines
+                keep = downsample_indices(xf_filtered, yf_filtered,
+                                          max(int(self.fft_ax.bbox.width), 1) * DECIMATION_POINTS_PER_PIXEL,
+                                          self.downsampling_mode.currentText())
+                line = self.fft_lines.get(y_column)
+                if line is None:
+                    line, = self.fft_ax.plot([], [], label=y_column, alpha=0.8)
+                    self.fft_lines[y_column] = line
+                line.set_data(xf_filtered[keep], yf_filtered[keep])
+                line.set_color(color)
+                line.set_linewidth(float(self.line_input.text()))
+                spectra[line] = (xf_filtered, yf_filtered)
                 legend_handles.append(line)
 
-            # Set FFT plot properties
-            self.fft_ax.set_xlabel('Frequency (Hz)', fontsize=20)
-
             # Set Y-axis label based on normalization
-            if normalization == "Amplitude":
+            if welch_settings is not None:
+                ylabel = 'Power Spectral Density'
+            elif normalization == "Amplitude":
                 ylabel = 'Amplitude'
             elif normalization == "Power":
                 ylabel = 'Power'
@@ -1148,32 +3505,49 @@ class SignalAnalyzer(QMainWindow):
             else:
                 ylabel = 'Magnitude'
 
-            self.fft_ax.set_ylabel(ylabel, fontsize=20)
-
             # Set title with FFT parameters
-            title = f'FFT Analysis - {self.title_input.text()}'
-            if zero_padding != "None":
-                title += f', {zero_padding} Zero Padding'
+            if welch_settings is not None:
+                segment_length = raw_spectra[selected_y_columns[0]][2]
+                title = f'Welch PSD - {self.title_input.text()}, {segment_length} Point Segments'
+                if welch_settings[2] == "Median":
+                    title += ', Median Averaging'
+            else:
+                title = f'FFT Analysis - {self.title_input.text()}'
+                if zero_padding != "None":
+                    title += f', {zero_padding} Zero Padding'
+                # Slow or adjusted FFT lengths are pointed out where the user looks
+                _, notice = self.fft_length(zero_padding, raw_spectra[selected_y_columns[0]][2])
+                if notice:
+                    title += f'\n{notice}'
             if smoothing_type != "None":
                 title += f', {smoothing_type} Smoothing'
-            self.fft_ax.set_title(title, fontsize=16, fontweight='bold')
-
-            self.fft_ax.grid(False)
-            self.fft_ax.legend(handles=legend_handles, loc='best', framealpha=0.9, fontsize=18)
 
-            # Set Y-axis scale
-            if y_scale == "Logarithmic":
-                self.fft_ax.set_yscale('log')
+            # Set FFT plot properties, relayout only when labels or legend change
+            layout_key = (ylabel, title, y_scale, tuple(selected_y_columns),
+                          tuple(str(line.get_color()) for line in legend_handles))
+            if self.layout_keys.get('fft') != layout_key:
+                self.layout_keys['fft'] = layout_key
+                self.fft_ax.set_xlabel('Frequency (Hz)', fontsize=20)
+                self.fft_ax.set_ylabel(ylabel, fontsize=20)
+                self.fft_ax.set_title(title, fontsize=16, fontweight='bold')
+                self.fft_ax.grid(False)
+                self.fft_ax.legend(handles=legend_handles, loc='best', framealpha=0.9, fontsize=18)
+
+                # Set Y-axis scale
+                self.fft_ax.set_yscale('log' if y_scale == "Logarithmic" else 'linear')
+
+                # Remove top and right spines for cleaner look
+                self.fft_ax.spines['top'].set_visible(False)
+                self.fft_ax.spines['right'].set_visible(False)
+                self.fft_figure.tight_layout()
 
             # Set X-axis limits
+            self.fft_ax.relim()
+            self.fft_ax.autoscale_view(scalex=False)
+            self.fft_spectra = spectra
+            self.fft_pick_indexes = {line: LinePickIndex(xf, yf) for line, (xf, yf) in spectra.items()}
             self.fft_ax.set_xlim(freq_min, freq_max)
-
-            # Remove top and right spines for cleaner look
-            self.fft_ax.spines['top'].set_visible(False)
-            self.fft_ax.spines['right'].set_visible(False)
-
-            self.fft_figure.tight_layout()
-            self.fft_canvas.draw_idle()
+            self.scheduler.draw(self.fft_canvas)
 
             # Switch to FFT tab
             self.plot_tabs.setCurrentIndex(1)
@@ -1181,6 +3555,90 @@ class SignalAnalyzer(QMainWindow):
         except Exception as e:
             print(f"Error calculating FFT: {e}")
 
+    def compute_raw_spectra(self, data_source, columns, rows, window_type, beta, zero_padding, sample_rate):
+        """
+        Windowed, zero padded one-sided FFT magnitudes of the given channels
+        :return: (frequencies, magnitudes, window length, coherent gain, ENBW) per channel
+        """
+        # All channels share the X range, so they are transformed together
+        block = data_source.matrix(columns, rows)
+        n = block.shape[1]
+        if n == 0:
+            raise ValueError("no samples in the X range")
+
+        # Apply selected window, in the precision of the channels
+        dtype = block.dtype if block.dtype.kind == 'f' else np.dtype(np.float64)
+        window, coherent_gain, enbw = cached_window(window_type, n, beta, dtype)
+
+        # Calculate the one-sided FFT of every channel at once. Magnitudes are
+        # kept in float32 for the spectrum cache, the display math runs in float64
+        n_fft, _ = self.fft_length(zero_padding, n)
+        xf, magnitudes = real_spectrum(block, window, n_fft, sample_rate)
+        magnitudes = magnitudes.astype(np.float32, copy=False)
+        return [(xf, magnitude, n, coherent_gain, enbw) for magnitude in magnitudes]
+
+    def fft_length(self, zero_padding, n):
+        """
+        FFT length for `n` samples with the selected zero padding
+        :return: (n_fft, notice), notice is a title note about a slow or adjusted length, or None
+        """
+        notice = None
+        if zero_padding == "None":
+            n_fft = n
+            if largest_prime_factor(n_fft) > FFT_MAX_PRIME_FACTOR:
+                notice = (f"slow length {n_fft:,} (prime factor {largest_prime_factor(n_fft):,}), "
+                          f"Fast length pads to {next_fast_len(n_fft, real=True):,}")
+        elif zero_padding == "2x":
+            n_fft = 2 * n
+        elif zero_padding == "4x":
+            n_fft = 4 * n
+        elif zero_padding == "8x":
+            n_fft = 8 * n
+        elif zero_padding == "Fast length":
+            n_fft = next_fast_len(n, real=True)
+        elif zero_padding == "Custom":
+            n_fft = int(self.custom_padding_input.text())
+            if n_fft < 1:
+                raise ValueError(f"FFT length must be at least 1, got {n_fft}")
+            if largest_prime_factor(n_fft) > FFT_MAX_PRIME_FACTOR:
+                fast_n_fft = next_fast_len(n_fft, real=True)
+                notice = (f"length {n_fft:,} (prime factor {largest_prime_factor(n_fft):,}) "
+                          f"rounded up to {fast_n_fft:,}")
+                n_fft = fast_n_fft
+        return n_fft, notice
+
+    def compute_welch_spectra(self, data_source, columns, rows, window_type, beta, welch_settings, sample_rate):
+        """
+        Welch PSD of the given channels, read in batches of segments
+        :param welch_settings: (segment length, overlap in %, 'Mean' or 'Median', bins kept for the median or None)
+        :return: (frequencies, psd, segment length, coherent gain, ENBW) per channel
+        """
+        segment_length, overlap, average, median_bins = welch_settings
+        if isinstance(rows, slice):
+            start, stop, _ = rows.indices(len(data_source))
+            block = None
+        else:
+            # Unsorted X data: the selected rows have to be gathered first
+            block = data_source.matrix(columns, rows)
+            start, stop = 0, block.shape[1]
+        n = stop - start
+        if n == 0:
+            raise ValueError("no samples in the X range")
+
+        def read_block(first, last):
+            if block is not None:
+                return block[:, first:last]
+            return data_source.matrix(columns, slice(start + first, start + last))
+
+        nperseg = max(1, min(segment_length, n))
+        step = max(1, nperseg - int(nperseg * overlap / 100))
+        dtype = read_block(0, 1).dtype
+        dtype = dtype if dtype.kind == 'f' else np.dtype(np.float64)
+        window, coherent_gain, enbw = cached_window(window_type, nperseg, beta, dtype)
+        xf, psd = welch_psd(read_block, n, len(columns), nperseg, window, step, sample_rate, average,
+                            median_bins)
+        return [(xf, channel_psd, nperseg, coherent_gain, enbw) for channel_psd in psd]
+
     def on_fft_click(self, event):
         """
         Handle clicks on FFT plot for point selection
@@ -1194,7 +3652,7 @@ class SignalAnalyzer(QMainWindow):
             # Right click to clear all selections
         if event.button == 3:
             self.clear_fft_selections()
-            self.fft_canvas.draw_idle()
+            self.scheduler.draw(self.fft_canvas)
             return
 
             # Check if clicking on existing annotation to drag it
@@ -1209,6 +3667,7 @@ class SignalAnalyzer(QMainWindow):
                     self.drag_start_y = event.y
                     # Store the current annotation offset
                     self.drag_current_offset = annotation.xyann
+                    self.fft_drag_blitter = BlitDragger(self.fft_canvas, [annotation])
                     return
 
             # Left click to add points (only if not dragging and not on toolbar)
@@ -1218,27 +3677,19 @@ class SignalAnalyzer(QMainWindow):
         x_click = event.xdata
         y_click = event.ydata
 
-        if x_click is None or y_click is None or x_click < 0 or x_click > 25:
+        if x_click is None or y_click is None:
             return
 
-        # Find the closest point on each signal
+        # Find the closest point of each spectrum in display pixels, so the
+        # distance means the same on linear and logarithmic axes
+        pick_range = self.fft_ax.transData.inverted().transform(
+            [(event.x - PICK_RADIUS_PIXELS, event.y), (event.x + PICK_RADIUS_PIXELS, event.y)])[:, 0]
+        to_display = lambda x, y: self.fft_ax.transData.transform(np.column_stack([x, y])).T
         closest_points = []
-        for i, line in enumerate(self.fft_ax.get_lines()):
-            x_data = line.get_xdata()
-            y_data = line.get_ydata()
-
-            # Find closest point within the visible range
-            visible_mask = (x_data >= 0) & (x_data <= 25)
-            x_visible = x_data[visible_mask]
-            y_visible = y_data[visible_mask]
-
-            if len(x_visible) > 0:
-                idx = np.abs(x_visible - x_click).argmin()
-                x_point = x_visible[idx]
-                y_point = y_visible[idx]
-
-                # Calculate distance (log scale for y)
-                dist = np.hypot(x_click - x_point, np.log10(max(y_click, 1e-10)) - np.log10(max(y_point, 1e-10)))
+        for i, (line, pick_index) in enumerate(self.fft_pick_indexes.items()):
+            picked = pick_index.nearest(*sorted(pick_range), to_display, (event.x, event.y))
+            if picked is not None:
+                dist, x_point, y_point = picked
                 closest_points.append((dist, x_point, y_point, line, i))
 
         if closest_points:
@@ -1246,7 +3697,7 @@ class SignalAnalyzer(QMainWindow):
             closest_points.sort(key=lambda x: x[0])
             dist, x_point, y_point, line, line_idx = closest_points[0]
 
-            if dist < 0.2:  # Adjust threshold as needed
+            if dist < PICK_RADIUS_PIXELS:
                 signal_name = line.get_label()
 
                 # Check if this point is already selected
@@ -1304,7 +3755,7 @@ class SignalAnalyzer(QMainWindow):
                     'draggable': True
                 })
 
-                self.fft_canvas.draw_idle()
+                self.scheduler.draw(self.fft_canvas)
 
     def on_fft_motion(self, event):
         """
@@ -1328,7 +3779,7 @@ class SignalAnalyzer(QMainWindow):
 
         self.dragging_fft_annotation.xyann = (new_dx, new_dy)
 
-        self.fft_canvas.draw_idle()
+        self.fft_drag_blitter.update()
 
     def on_fft_release(self, event):
         """
@@ -1338,6 +3789,9 @@ class SignalAnalyzer(QMainWindow):
             # Update the stored position with the final offset
             final_offset = self.dragging_fft_annotation.xyann
             self.fft_selected_points[self.dragging_fft_index]['position'] = final_offset
+        if self.fft_drag_blitter is not None:
+            self.fft_drag_blitter.finish()
+            self.fft_drag_blitter = None
 
         self.dragging_fft_annotation = None
         self.dragging_fft_index = None
@@ -1457,9 +3911,17 @@ class SignalAnalyzer(QMainWindow):
             return
 
         try:
-            # Clear previous CWT plot
-            self.cwt_figure.clear()
-            self.cwt_ax = self.cwt_figure.add_subplot(111)
+            self.build_cwt_tab()
+            self.cwt_stale = False
+            # Reuse the axes and images of the previous CWT plot
+            if self.cwt_ax not in self.cwt_figure.axes:
+                self.cwt_figure.clear()
+                self.cwt_ax = self.cwt_figure.add_subplot(111)
+                # Limits are always set explicitly, so re-imaging on zoom never autoscales
+                self.cwt_ax.set_autoscale_on(False)
+                self.cwt_ax.callbacks.connect('xlim_changed', lambda ax: self.redecimate_cwt())
+                self.cwt_images = {}
+                self.layout_keys.pop('cwt', None)
             self.cwt_annotations.clear()
             self.cwt_markers.clear()
 
@@ -1470,7 +3932,14 @@ class SignalAnalyzer(QMainWindow):
                 if item.checkState() == Qt.CheckState.Checked:
                     selected_y_columns.append(item.text())
 
+            self.cwt_magnitudes = {}
+            self.cwt_pooled_view = None
+            for y_column in [name for name in self.cwt_images if name not in selected_y_columns]:
+                image, colorbar = self.cwt_images.pop(y_column)
+                colorbar.remove()
+                image.remove()
             if not selected_y_columns:
+                self.scheduler.draw(self.cwt_canvas)
                 return
 
             # Get data source
@@ -1484,24 +3953,9 @@ class SignalAnalyzer(QMainWindow):
             x_column = self.x_axis_combo.currentText()
 
             # Apply X-axis range filtering
-            x_min = self.x_min_input.text().strip()
-            x_max = self.x_max_input.text().strip()
-            filtered_data = data_source.copy()
-
-            if x_min:
-                try:
-                    x_min_val = float(x_min)
-                    filtered_data = filtered_data[filtered_data[x_column] >= x_min_val]
-                except ValueError:
-                    pass
-            if x_max:
-                try:
-                    x_max_val = float(x_max)
-                    filtered_data = filtered_data[filtered_data[x_column] <= x_max_val]
-                except ValueError:
-                    pass
-
-            time_data = filtered_data[x_column].values
+            x_min_val, x_max_val = self.get_x_range()
+            rows = data_source.rows_in_range(x_column, x_min_val, x_max_val)
+            time_data = data_source.column_rows(x_column, rows)
 
             # Get CWT parameters
             wavelet = self.wavelet_type.currentText()
@@ -1512,48 +3966,65 @@ class SignalAnalyzer(QMainWindow):
 
             # Get sampling rate
             sampling_rate = float(self.cwt_sampling_rate.text())
-            if len(time_data) > 1:
-                actual_sampling_rate = 1.0 / (time_data[1] - time_data[0])
-            else:
-                actual_sampling_rate = sampling_rate
+            actual_sampling_rate = data_source.sample_rate(x_column) or sampling_rate
 
             # Calculate frequencies corresponding to scales
             center_freq = pywt.central_frequency(wavelet)
             frequencies = center_freq * actual_sampling_rate / scales
 
-            # Plot each selected signal
+            # Plot each selected signal, imaged at the pixel width of the axes
+            width = max(int(self.cwt_ax.bbox.width), 1)
             for y_column in selected_y_columns:
-                signal_data = filtered_data[y_column].values
+                signal_data = data_source.column_rows(y_column, rows)
 
                 # Perform CWT only if we have data in the selected range
                 if len(signal_data) > 0:
                     coefficients, freqs = pywt.cwt(signal_data, scales, wavelet,
                                                    sampling_period=1.0 / actual_sampling_rate)
-
-                    # Plot CWT with the actual time range
-                    im = self.cwt_ax.imshow(np.abs(coefficients),
-                                            extent=[time_data[0], time_data[-1],
-                                                    frequencies[-1], frequencies[0]],
-                                            aspect='auto',
-                                            cmap=self.colormap.currentText(),
-                                            vmin=float(self.cwt_min.text()),
-                                            vmax=float(self.cwt_max.text()))
-
-                    # Add colorbar
-                    self.cwt_figure.colorbar(im, ax=self.cwt_ax, label='Magnitude')
-
-            # Set CWT plot properties
-            self.cwt_ax.set_xlabel('Time (s)', fontsize=20)
-            self.cwt_ax.set_ylabel('Frequency (Hz)', fontsize=20)
-            self.cwt_ax.set_title(f'CWT Analysis - {wavelet} Wavelet', fontsize=16, fontweight='bold')
-            self.cwt_ax.grid(False)
-
-            # Set logarithmic scale for frequency axis if needed
-            if scales_max / scales_min > 10:
-                self.cwt_ax.set_yscale('log')
-
-            self.cwt_figure.tight_layout()
-            self.cwt_canvas.draw_idle()
+                    # Magnitudes are kept to re-image zoomed ranges, float32 halves their memory
+                    magnitude = np.abs(coefficients).astype(np.float32)
+                    del coefficients
+                    self.cwt_magnitudes[y_column] = magnitude
+                    self.cwt_time = (time_data[0], time_data[-1], len(time_data))
+                    self.cwt_pooled_view = (0, len(time_data), width)
+
+                    # Plot CWT with the actual time range, updating the channel's image if it has one
+                    extent = [time_data[0], time_data[-1], frequencies[-1], frequencies[0]]
+                    if y_column in self.cwt_images:
+                        im, colorbar = self.cwt_images[y_column]
+                        im.set_data(maxpool_columns(magnitude, width))
+                        im.set_extent(extent)
+                        im.set_cmap(self.colormap.currentText())
+                        im.set_clim(float(self.cwt_min.text()), float(self.cwt_max.text()))
+                    else:
+                        im = self.cwt_ax.imshow(maxpool_columns(magnitude, width),
+                                                extent=extent,
+                                                aspect='auto',
+                                                cmap=self.colormap.currentText(),
+                                                vmin=float(self.cwt_min.text()),
+                                                vmax=float(self.cwt_max.text()))
+
+                        # Add colorbar
+                        colorbar = self.cwt_figure.colorbar(im, ax=self.cwt_ax, label='Magnitude')
+                        self.cwt_images[y_column] = (im, colorbar)
+
+            # Set CWT plot properties, relayout only when labels or colorbars change
+            log_scale = scales_max / scales_min > 10
+            layout_key = (wavelet, log_scale, tuple(self.cwt_images))
+            if self.layout_keys.get('cwt') != layout_key:
+                self.layout_keys['cwt'] = layout_key
+                self.cwt_ax.set_xlabel('Time (s)', fontsize=20)
+                self.cwt_ax.set_ylabel('Frequency (Hz)', fontsize=20)
+                self.cwt_ax.set_title(f'CWT Analysis - {wavelet} Wavelet', fontsize=16, fontweight='bold')
+                self.cwt_ax.grid(False)
+
+                # Set logarithmic scale for frequency axis if needed
+                self.cwt_ax.set_yscale('log' if log_scale else 'linear')
+                self.cwt_figure.tight_layout()
+            if len(time_data) > 0:
+                self.cwt_ax.set_xlim(time_data[0], time_data[-1])
+                self.cwt_ax.set_ylim(frequencies[-1], frequencies[0])
+            self.scheduler.draw(self.cwt_canvas)
 
             # Switch to CWT tab
             self.plot_tabs.setCurrentIndex(2)
@@ -1561,12 +4032,48 @@ class SignalAnalyzer(QMainWindow):
         except Exception as e:
             print(f"Error calculating CWT: {e}")
 
+    def cwt_visible_samples(self):
+        """:return: (start, stop, width) sample range of the CWT shown in the axes and their pixel width"""
+        t0, t1, n = self.cwt_time
+        x_lo, x_hi = sorted(self.cwt_ax.get_xlim())
+        samples_per_second = (n - 1) / (t1 - t0) if t1 != t0 else 0.0
+        start = int(np.clip(np.floor((x_lo - t0) * samples_per_second), 0, n - 1))
+        stop = int(np.clip(np.ceil((x_hi - t0) * samples_per_second), start, n - 1)) + 1
+        return start, stop, max(int(self.cwt_ax.bbox.width), 1)
+
+    def redecimate_cwt(self):
+        """Max-pool the cached CWT magnitudes of the visible time range to the axes pixels"""
+        if not self.cwt_magnitudes:
+            return
+        try:
+            view = self.cwt_visible_samples()
+            if view == self.cwt_pooled_view:
+                return
+            self.cwt_pooled_view = view
+            start, stop, width = view
+            t0, t1, n = self.cwt_time
+            dt = (t1 - t0) / (n - 1) if n > 1 else 0.0
+            for y_column, magnitude in self.cwt_magnitudes.items():
+                im, colorbar = self.cwt_images[y_column]
+                f_bottom, f_top = im.get_extent()[2:]
+                im.set_data(maxpool_columns(magnitude[:, start:stop], width))
+                im.set_extent([t0 + start * dt, t0 + (stop - 1) * dt, f_bottom, f_top])
+            self.scheduler.draw(self.cwt_canvas)
+        except Exception as e:
+            print(f"Error decimating CWT: {e}")
+
     def wvd(self):
         """Placeholder for WVD functionality"""
         pass
 
 
 def main():
+    if sys.argv[1:3] == ['--benchmark', 'csv']:
+        benchmark_csv_engines()
+        return
+    if sys.argv[1:3] == ['--benchmark', 'fft']:
+        benchmark_fft_lengths()
+        return
     app = QApplication(sys.argv)
     style_sheet = """
             /* Estilos generales para los 4 paneles para hacerlos visibles */
@@ -1628,7 +4135,10 @@ def main():
     app.setStyleSheet(style_sheet)
     window = SignalAnalyzer()
     window.showMaximized()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    if '--profile-redraws' in sys.argv:
+        window.scheduler.report()
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':